@@ -2,6 +2,7 @@
 import os
 import re
 import io
+import csv
 import json
 import time
 import html
@@ -10,9 +11,15 @@ import logging
 import sqlite3
 import threading
 import math
-from string import Template
-from collections import defaultdict
+import sys
+import itertools
+import hashlib
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from string import Template, ascii_letters
+from collections import Counter, defaultdict
 from dataclasses import dataclass
+from bisect import bisect_right
 from functools import lru_cache
 from typing import Any, Dict, List, Optional, Set
 from urllib.parse import quote_plus, urljoin
@@ -21,13 +28,29 @@ import xml.etree.ElementTree as ET
 # 서드파티 라이브러리
 import requests
 from requests.adapters import HTTPAdapter, Retry
-from bs4 import BeautifulSoup
-import pandas as pd
+from bs4 import BeautifulSoup, SoupStrainer
 import streamlit as st
 from dotenv import load_dotenv
-from openai import OpenAI
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+# openai SDK는 import 비용이 커서 클라이언트를 처음 만들 때 지연 import (_get_ai_client / _get_lang_client)
+try:
+    import orjson  # 선택 의존성: 있으면 알라딘 JSON 파싱 / 프롬프트 JSON 직렬화를 C 구현으로
+    _json_loads = orjson.loads
+    def _json_dumps_compact(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:
+    _json_loads = json.loads
+    def _json_dumps_compact(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+try:
+    import lxml  # noqa: F401  선택 의존성: 있으면 BeautifulSoup 파서를 C 구현(lxml)으로
+    _BS_PARSER = "lxml"
+except ImportError:
+    _BS_PARSER = "html.parser"
+# pandas / gspread / oauth2client 는 사용하는 함수 안에서 지연 import
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:  # 구버전 streamlit
+    add_script_run_ctx = get_script_run_ctx = None
 from pymarc import Record, Field, MARCWriter, Subfield           #✅ mrc 다운로드를 위해 requirements에 pymarc 추가해야함
 
 class MarcBuilder:
@@ -123,13 +146,75 @@ def _get_session() -> requests.Session:
         status_forcelist=[429, 500, 502, 503, 504],
         allowed_methods=["GET"], raise_on_status=False
     )
-    adapter = HTTPAdapter(max_retries=retries, pool_connections=10, pool_maxsize=10)
+    # NLK/알라딘/위키데이터 등 호스트별 keep-alive 커넥션 재사용 (병렬 호출 대비 풀 확장)
+    adapter = HTTPAdapter(max_retries=retries, pool_connections=32, pool_maxsize=64)
     s.mount("https://", adapter)
     s.mount("http://", adapter)
     return s
 
 SESSION = _get_session()
 
+# =========================
+# 🧵 백그라운드 작업 풀 (워커 스레드에서도 st.* 출력이 보이도록 컨텍스트 연결)
+# =========================
+def _attach_st_ctx(ctx):
+    if ctx is not None and add_script_run_ctx is not None:
+        add_script_run_ctx(threading.current_thread(), ctx)
+
+def _attach_worker_state(ctx, ui_ops):
+    _attach_st_ctx(ctx)
+    _ui_local.ops = ui_ops   # 만든 쪽 스레드가 출력을 모으는 중이면 하위 워커도 같은 목록에 기록
+
+def _st_thread_pool(max_workers: int, ui_ops: list = None) -> ThreadPoolExecutor:
+    ctx = get_script_run_ctx() if get_script_run_ctx is not None else None
+    if ui_ops is None:
+        ui_ops = getattr(_ui_local, "ops", None)
+    return ThreadPoolExecutor(max_workers=max_workers, initializer=_attach_worker_state, initargs=(ctx, ui_ops))
+
+# =========================
+# 🧾 처리 중 st.* 출력 모으기 (일괄 처리 워커 → 메인 스레드에서 CSV 순서대로 렌더)
+# =========================
+_ui_local = threading.local()
+
+class _UiExpander:
+    """기록 중 `with ui.expander(...)` 안의 출력은 이 expander의 하위 목록으로"""
+    def __init__(self, children: list):
+        self.children = children
+        self.outer = None
+
+    def __enter__(self):
+        self.outer = _ui_local.ops
+        _ui_local.ops = self.children
+        return self
+
+    def __exit__(self, *exc):
+        _ui_local.ops = self.outer
+        return False
+
+class _UiProxy:
+    """현재 스레드에 수집 목록(_ui_local.ops)이 있으면 st.* 호출을 기록만 하고, 없으면 그대로 st.*로 출력"""
+    def __getattr__(self, name):
+        ops = getattr(_ui_local, "ops", None)
+        if ops is None:
+            return getattr(st, name)
+
+        def record(*args, **kwargs):
+            children = [] if name == "expander" else None
+            ops.append((name, args, kwargs, children))
+            return _UiExpander(children) if children is not None else None
+        return record
+
+ui = _UiProxy()
+
+def _ui_replay(ops: list) -> None:
+    """기록해 둔 출력을 순서대로 ui.*로 다시 출력 (호출 스레드도 수집 중이면 그 목록에 이어서 기록)"""
+    for name, args, kwargs, children in ops or ():
+        if children is not None:
+            with ui.expander(*args, **kwargs):
+                _ui_replay(children)
+        else:
+            getattr(ui, name)(*args, **kwargs)
+
 # =========================
 # 🔐 Secrets / Env
 # =========================
@@ -153,18 +238,43 @@ DEFAULT_MODEL = (st.secrets.get("openai", {}) or {}).get("model") or os.getenv("
 model = DEFAULT_MODEL              # 별칭
 
 # 맨 위 어딘가 (OPENAI_API_KEY 선언 이후)
-try:
-    from openai import OpenAI
-    _client = OpenAI(api_key=OPENAI_API_KEY, timeout=10) if OPENAI_API_KEY else None
-except Exception:
-    _client = None
+@st.cache_resource(show_spinner=False)
+def _get_ai_client():
+    """700 이름순서/940 보조용 OpenAI 클라이언트 (키가 없거나 SDK를 못 쓰면 None)"""
+    if not OPENAI_API_KEY:
+        return None
+    try:
+        from openai import OpenAI
+        return OpenAI(api_key=OPENAI_API_KEY, timeout=10)
+    except Exception:
+        return None
 
 
 # ===== 환경변수 로드 =====
 load_dotenv()
 ALADIN_KEY = os.getenv("ALADIN_TTB_KEY")
 OPENAI_KEY = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=OPENAI_KEY)
+
+# 언어 추정/653용 OpenAI 클라이언트: import 시점이 아니라 첫 호출 때 한 번만 생성
+@st.cache_resource(show_spinner=False)
+def _get_lang_client():
+    from openai import OpenAI
+    return OpenAI(api_key=OPENAI_KEY or OPENAI_API_KEY)
+
+# KDC 분류(ask_llm_for_kdc)는 공용 SESSION으로 api.openai.com에 POST →
+# 첫 요청이 TCP/TLS 핸드셰이크를 떠안지 않도록 프로세스당 한 번 백그라운드로 연결만 열어 둠
+@st.cache_resource(show_spinner=False)
+def _prewarm_openai_connection() -> bool:
+    def _warm():
+        try:
+            SESSION.head("https://api.openai.com/v1/models", timeout=(3, 5))
+        except Exception:
+            pass
+    threading.Thread(target=_warm, daemon=True).start()
+    return True
+
+if OPENAI_KEY or OPENAI_API_KEY:
+    _prewarm_openai_connection()
 
 # ===== ISDS 언어코드 매핑 =====
 ISDS_LANGUAGE_CODES = {
@@ -188,6 +298,24 @@ def _extract_code_and_reason(content, code_key="$h"):
             signals = ln.split("=", 1)[1].strip()
     return code, reason, signals
 
+def _lang_gpt_content(system_content: str, prompt: str, code_key: str = "$h") -> str:
+    """041 언어 추정 GPT 응답 본문. 프롬프트(=입력 전체) 해시로 디스크 캐시(SQLite)에 저장해 재처리 시 재호출 안 함
+    (code_key 줄의 코드가 ALLOWED_CODES일 때만 저장 → 불량 응답은 다음 실행에서 다시 물어봄)"""
+    key = "gptlang|" + hashlib.sha256(f"{system_content}\n{prompt}".encode("utf-8")).hexdigest()
+    content = cache_get(key)
+    if isinstance(content, str) and content:
+        return content
+    resp = _get_lang_client().chat.completions.create(
+        model="gpt-4o",
+        messages=[{"role": "system", "content": system_content},
+                  {"role": "user", "content": prompt}],
+        temperature=0
+    )
+    content = (resp.choices[0].message.content or "").strip()
+    if _extract_code_and_reason(content, code_key)[0] in ALLOWED_CODES:
+        cache_set(key, content)
+    return content
+
 # ===== GPT 판단 함수 (원서; 일반) =====
 def gpt_guess_original_lang(title, category, publisher, author="", original_title=""):
     prompt = f"""
@@ -212,13 +340,7 @@ def gpt_guess_original_lang(title, category, publisher, author="", original_titl
     #signals=[잡은 단서들, 콤마로](선택)
     """.strip()
     try:
-        resp = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "system","content":"사서용 언어 추정기"},
-                      {"role":"user","content":prompt}],
-            temperature=0
-        )
-        content = (resp.choices[0].message.content or "").strip()
+        content = _lang_gpt_content("사서용 언어 추정기", prompt, "$h")
         code, reason, signals = _extract_code_and_reason(content, "$h")
         if code not in ALLOWED_CODES:
             code = "und"
@@ -253,22 +375,16 @@ def gpt_guess_main_lang(title, category, publisher):
     #signals=[잡은 단서들, 콤마로](선택)
     """.strip()
     try:
-        resp = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "system","content":"사서용 본문 언어 추정기"},
-                      {"role":"user","content":prompt}],
-            temperature=0
-        )
-        content = (resp.choices[0].message.content or "").strip()
+        content = _lang_gpt_content("사서용 본문 언어 추정기", prompt, "$a")
         code, reason, signals = _extract_code_and_reason(content, "$a")
         if code not in ALLOWED_CODES:
             code = "und"
-        st.write(f"🧭 [GPT 근거] $a={code}")
-        if reason: st.write(f"🧭 [이유] {reason}")
-        if signals: st.write(f"🧭 [단서] {signals}")
+        ui.write(f"🧭 [GPT 근거] $a={code}")
+        if reason: ui.write(f"🧭 [이유] {reason}")
+        if signals: ui.write(f"🧭 [단서] {signals}")
         return code
     except Exception as e:
-        st.error(f"GPT 오류: {e}")
+        ui.error(f"GPT 오류: {e}")
         return "und"
 
 # ===== GPT 판단 함수 (신규) — 저자 기반 원서 언어 추정 =====
@@ -294,57 +410,38 @@ def gpt_guess_original_lang_by_author(author, title="", category="", publisher="
     #signals=[잡은 단서들, 콤마로](선택)
     """.strip()
     try:
-        resp = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role":"system","content":"저자 기반 원서 언어 추정기"},
-                      {"role":"user","content":prompt}],
-            temperature=0
-        )
-        content = (resp.choices[0].message.content or "").strip()
+        content = _lang_gpt_content("저자 기반 원서 언어 추정기", prompt, "$h")
         code, reason, signals = _extract_code_and_reason(content, "$h")
         if code not in ALLOWED_CODES:
             code = "und"
-        st.write(f"🧭 [저자기반 근거] $h={code}")
-        if reason: st.write(f"🧭 [이유] {reason}")
-        if signals: st.write(f"🧭 [단서] {signals}")
+        ui.write(f"🧭 [저자기반 근거] $h={code}")
+        if reason: ui.write(f"🧭 [이유] {reason}")
+        if signals: ui.write(f"🧭 [단서] {signals}")
         return code
     except Exception as e:
-        st.error(f"GPT(저자기반) 오류: {e}")
+        ui.error(f"GPT(저자기반) 오류: {e}")
         return "und"
 
 # ===== 언어 감지 함수들 =====
-def detect_language_by_unicode(text):
-    text = re.sub(r'[\s\W_]+', '', text or "")
-    if not text:
-        return 'und'
-    c = text[0]
-    if '\uac00' <= c <= '\ud7a3': return 'kor'
-    if '\u3040' <= c <= '\u30ff': return 'jpn'
-    if '\u4e00' <= c <= '\u9fff': return 'chi'
-    if '\u0600' <= c <= '\u06FF': return 'ara'
-    if '\u0e00' <= c <= '\u0e7f': return 'tha'
-    return 'und'
-
-def override_language_by_keywords(text, initial_lang):
-    text = (text or "").lower()
-    if initial_lang == 'chi' and re.search(r'[\u3040-\u30ff]', text): return 'jpn'
-    if initial_lang in ['und', 'eng']:
-        if "spanish" in text or "español" in text: return "spa"
-        if "italian" in text or "italiano" in text: return "ita"
-        if "french" in text or "français" in text: return "fre"
-        if "portuguese" in text or "português" in text: return "por"
-        if "german" in text or "deutsch" in text: return "ger"
-        if any(ch in text for ch in ['é','è','ê','à','ç','ù','ô','â','î','û']): return "fre"
-        if any(ch in text for ch in ['ñ','á','í','ó','ú']): return "spa"
-        if any(ch in text for ch in ['ã','õ']): return "por"
-    return initial_lang
-
-def detect_language(text):
-    lang = detect_language_by_unicode(text)
-    return override_language_by_keywords(text, lang)
+# 문자권 코드포인트 구간표: (시작, 끝, 언어) → 시작값 정렬 후 bisect 한 번으로 판정
+def _lang_range_table(ranges):
+    ranges = sorted(ranges)
+    return [lo for lo, _, _ in ranges], [(hi, lang) for _, hi, lang in ranges]
+
+def _lang_by_range(cp: int, table):
+    starts, ends = table
+    i = bisect_right(starts, cp) - 1
+    if i >= 0:
+        hi, lang = ends[i]
+        if cp <= hi:
+            return lang
+    return None
+
+_RE_CATEGORY_SPLIT = re.compile(r'[>/\s]+')
+_RE_PARENS_RUN = re.compile(r'[()]+')
 
 def detect_language_from_category(text):
-    words = re.split(r'[>/\s]+', text or "")
+    words = _RE_CATEGORY_SPLIT.split(text or "")
     for w in words:
         if "일본" in w: return "jpn"
         if "중국" in w: return "chi"
@@ -362,8 +459,8 @@ def detect_language_from_category(text):
 def tokenize_category(text: str):
     if not text:
         return []
-    t = re.sub(r'[()]+', ' ', text)
-    raw = re.split(r'[>/\s]+', t)
+    t = _RE_PARENS_RUN.sub(' ', text)
+    raw = _RE_CATEGORY_SPLIT.split(t)
     tokens = []
     for w in raw:
         w = w.strip()
@@ -430,12 +527,20 @@ def is_nonfiction_override(category_text: str) -> bool:
 def strip_ns(tag): return tag.split('}')[-1] if '}' in tag else tag
 
 # ===== 웹 크롤링 =====
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _fetch_aladin_html(url: str, timeout: int = 15) -> str:
+    """알라딘 상품/상세 페이지 HTML (같은 URL 재요청은 캐시, 실패는 예외로 올려 캐시하지 않음)"""
+    res = SESSION.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=timeout)
+    res.raise_for_status()
+    return res.text
+
+# 원제/언어/카테고리 박스만 트리로 만듦 (상품 페이지 전체 파싱 방지)
+_ALADIN_FALLBACK_ONLY = SoupStrainer("div", class_=["info_original", "conts_info_list1", "conts_info_list2"])
+
 def crawl_aladin_fallback(isbn13):
     url = f"https://www.aladin.co.kr/shop/wproduct.aspx?ISBN={isbn13}"
-    headers = {"User-Agent": "Mozilla/5.0"}
     try:
-        res = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(res.text, "html.parser")
+        soup = BeautifulSoup(_fetch_aladin_html(url, 10), _BS_PARSER, parse_only=_ALADIN_FALLBACK_ONLY)
         original = soup.select_one("div.info_original")
         lang_info = soup.select_one("div.conts_info_list1")
         category_text = ""
@@ -453,7 +558,7 @@ def crawl_aladin_fallback(isbn13):
             "category_text": category_text
         }
     except Exception as e:
-        dbg_error(f"❌ 크롤링 중 오류 발생: {e}")
+        dbg_err(f"❌ 크롤링 중 오류 발생: {e}")
         return {}
 
 # ===== 결과 조정(충돌 해소) =====
@@ -464,7 +569,7 @@ def reconcile_language(candidate, fallback_hint=None, author_hint=None):
     author_hint: 저자 기반 GPT 결과
     """
     if author_hint and author_hint != "und" and author_hint != candidate:
-        st.write(f"🔁 [조정] 저자기반({author_hint}) ≠ 1차({candidate}) → 저자기반 우선")
+        ui.write(f"🔁 [조정] 저자기반({author_hint}) ≠ 1차({candidate}) → 저자기반 우선")
         return author_hint
     if fallback_hint and fallback_hint != "und" and fallback_hint != candidate:
         if candidate in {"ita","fre","spa","por"}:
@@ -472,7 +577,7 @@ def reconcile_language(candidate, fallback_hint=None, author_hint=None):
                 # 영어 힌트는 흔히 과대검출 — GPT 결과 유지
                 return candidate
             # 영어가 아니라면(예: ger vs fre) 규칙 힌트를 우선
-            st.write(f"🔁 [조정] 규칙힌트({fallback_hint}) vs 1차({candidate}) → 규칙힌트 우선")
+            ui.write(f"🔁 [조정] 규칙힌트({fallback_hint}) vs 1차({candidate}) → 규칙힌트 우선")
             return fallback_hint
             
     return candidate
@@ -547,8 +652,9 @@ def is_domestic_category(category_text: str) -> bool:
     return "국내도서" in (category_text or "")
 
 # ===== KORMARC 태그 생성기 =====
-def get_kormarc_tags(isbn):
-    isbn = isbn.strip().replace("-", "")
+@st.cache_data(ttl=24*3600, show_spinner=False)
+def _aladin_itemlookup_xml(isbn: str) -> bytes:
+    """ItemLookUp XML 원문 (ISBN 단위 캐시, 실패는 예외로 올려 캐시되지 않게 함)"""
     url = "http://www.aladin.co.kr/ttb/api/ItemLookUp.aspx"
     params = {
         "ttbkey": ALADIN_KEY,
@@ -557,22 +663,25 @@ def get_kormarc_tags(isbn):
         "output": "xml",
         "Version": "20131101"
     }
+    response = SESSION.get(url, params=params, timeout=(5, 15))
+    if response.status_code != 200:
+        raise ValueError("API 호출 실패")
+    return response.content
+
+def get_kormarc_tags(isbn):
+    isbn = isbn.strip().replace("-", "")
     try:
-        response = requests.get(url, params=params)
-        if response.status_code != 200:
-            raise ValueError("API 호출 실패")
-        root = ET.fromstring(response.content)
-        for elem in root.iter():
-            elem.tag = strip_ns(elem.tag)
-        item = root.find("item")
+        root = ET.fromstring(_aladin_itemlookup_xml(isbn))
+        # 네임스페이스 와일드카드({*})로 바로 찾음 (전체 트리 태그 재작성 없이)
+        item = root.find("{*}item")
         if item is None:
             raise ValueError("<item> 태그 없음")
 
-        title = item.findtext("title", default="")
-        publisher = item.findtext("publisher", default="")
-        author = item.findtext("author", default="")
-        subinfo = item.find("subInfo")
-        original_title = subinfo.findtext("originalTitle") if subinfo is not None else ""
+        title = item.findtext("{*}title", default="")
+        publisher = item.findtext("{*}publisher", default="")
+        author = item.findtext("{*}author", default="")
+        subinfo = item.find("{*}subInfo")
+        original_title = subinfo.findtext("{*}originalTitle") if subinfo is not None else ""
         original_title = html.unescape(original_title or "")
 
         crawl = crawl_aladin_fallback(isbn)
@@ -629,6 +738,8 @@ def get_kormarc_tags(isbn):
     except Exception as e:
         return f"📕 예외 발생: {e}", "", ""
 
+_RE_041_PREFIX = re.compile(r"^=?\s*041\s*")
+
 def _as_mrk_041(tag_041: str | None) -> str | None:
     """
     '041 $akor$hrus' → '=041  1\\$akor$hrus'
@@ -638,9 +749,9 @@ def _as_mrk_041(tag_041: str | None) -> str | None:
         return None
     s = tag_041.strip()
     # 앞의 '041' / '=041' 제거
-    s = re.sub(r"^=?\s*041\s*", "", s)
+    s = _RE_041_PREFIX.sub("", s)
     # 서브필드 사이 공백 제거
-    s = re.sub(r"\s+", "", s)
+    s = "".join(s.split())
     if not s.startswith("$a"):
         return None
     return f"=041  1\\{s}"
@@ -694,14 +805,21 @@ HEADERS = {
 DEFAULT_TIMEOUT = 10  # seconds
 
 # CSV 로드
-def load_uploaded_csv(uploaded):
-    import io
+def load_uploaded_csv(uploaded) -> tuple[list[str], list[dict]]:
+    """업로드 CSV → (열 이름 목록, 행 dict 목록)
+    몇 개 열짜리 문자열 표라 pandas DataFrame 없이 표준 csv로 읽음 (구분자는 첫 줄로 추정)"""
     content = uploaded.getvalue()
     last_err = None
     for enc in ("utf-8-sig", "utf-8", "cp949", "euc-kr"):
         try:
             text = content.decode(enc)
-            return pd.read_csv(io.StringIO(text), engine="python", sep=None, dtype=str)
+            try:
+                dialect = csv.Sniffer().sniff(text.partition("\n")[0])
+            except csv.Error:
+                dialect = csv.excel
+            reader = csv.DictReader(io.StringIO(text), dialect=dialect)
+            rows = list(reader)
+            return list(reader.fieldnames or []), rows
         except Exception as e:
             last_err = e
     raise RuntimeError(f"CSV 인코딩/파싱 실패: {last_err}")
@@ -868,22 +986,14 @@ def parse_people_flexible(author_str: str) -> dict:
     if pending:
         _assign(pending, "author")
 
-    # 중복 제거(역할별)
+    # 중복 제거(역할별, 순서 유지)
     for k, arr in out.items():
-        seen = set(); uniq=[]
-        for x in arr:
-            if x not in seen:
-                seen.add(x); uniq.append(x)
-        out[k] = uniq
+        out[k] = list(dict.fromkeys(arr))
 
     return out
 
 def _dedup(seq):
-    seen=set(); out=[]
-    for x in seq:
-        if x not in seen:
-            seen.add(x); out.append(x)
-    return out
+    return list(dict.fromkeys(seq))
 
 def extract_people_from_aladin(item: dict) -> dict:
     res = {"author":[], "translator":[], "illustrator":[], "editor":[], "other":[]}
@@ -912,10 +1022,10 @@ def extract_people_from_aladin(item: dict) -> dict:
 
     return res
 
-def build_700_from_people(people: dict, reorder_fn=None, aladin_item=None) -> list[str]:
+def build_700_from_people(people: dict, reorder_fn=None, aladin_item=None) -> list[tuple]:
     """
     people 딕셔너리(author, editor, illustrator, translator)를 기반으로
-    700 필드를 역할 순서(지은이→엮은이→그림→옮긴이)로 생성
+    700 필드를 역할 순서(지은이→엮은이→그림→옮긴이)로 (Field, MRK) 쌍으로 생성
     """
     lines = []
 
@@ -929,19 +1039,19 @@ def build_700_from_people(people: dict, reorder_fn=None, aladin_item=None) -> li
 
     # 1️⃣ 지은이
     for a in authors:
-        lines.append(f"=700  1\\$a{reorder(a)}")
+        lines.append(_a_field_pair("700", "1", " ", reorder(a)))
 
     # 2️⃣ 엮은이
     for e in edtrs:
-        lines.append(f"=700  1\\$a{reorder(e)}")
+        lines.append(_a_field_pair("700", "1", " ", reorder(e)))
 
     # 3️⃣ 그림
     for i in illus:
-        lines.append(f"=700  1\\$a{reorder(i)}")
+        lines.append(_a_field_pair("700", "1", " ", reorder(i)))
 
     # 4️⃣ 옮긴이
     for t in trans:
-        lines.append(f"=700  1\\$a{reorder(t)}")
+        lines.append(_a_field_pair("700", "1", " ", reorder(t)))
 
     return lines
 
@@ -1086,7 +1196,8 @@ def decide_name_order_via_llm(hangul_name: str, ctx_key: str = "") -> dict:
         return {"action":"KEEP","result":name,"reason":"mononym","confidence":0.9}
 
     # API 없으면 간단 폴백(2어절만 뒤집기)
-    if not _client or not OPENAI_API_KEY:
+    client = _get_ai_client()
+    if not client or not OPENAI_API_KEY:
         parts = name.split()
         if len(parts) == 2 and _HANGUL_RE.search(name):
             first, last = parts[0], parts[1]
@@ -1095,7 +1206,7 @@ def decide_name_order_via_llm(hangul_name: str, ctx_key: str = "") -> dict:
 
     try:
         user_msg = f'이름: "{name}"\n컨텍스트: {ctx_key}'
-        resp = _client.responses.create(
+        resp = client.responses.create(
             model="gpt-4o-mini",
             instructions=SYSTEM_PROMPT,
             input=user_msg,
@@ -1119,14 +1230,15 @@ def decide_name_order_via_llm(hangul_name: str, ctx_key: str = "") -> dict:
             return {"action":"REORDER","result":f"{last}, {first}","reason":f"fallback:{e}","confidence":0.4}
         return {"action":"KEEP","result":name,"reason":f"fallback-keep:{e}","confidence":0.4}
 
+_EAST_ASIAN_LANGS = frozenset({"jpn", "chi", "zho"})                  # 성-이름 문화권 (일본/중국/등)
+_WESTERN_LANGS    = frozenset({"eng", "fre", "ger", "spa", "ita", "rus"})  # 이름-성 문화권
+
 def reorder_hangul_name_for_700(
     name: str,
     *,
     aladin_item: dict | None = None,
     origin_lang_code: str | None = None
 ):
-    east_asian_langs = {"jpn", "chi", "zho"}   # 성-이름 문화권 (일본/중국/등)
-    western_langs    = {"eng", "fre", "ger", "spa", "ita", "rus"}  # 이름-성 문화권
 
     s = (name or "").strip()
     if not s:
@@ -1137,11 +1249,11 @@ def reorder_hangul_name_for_700(
         code3 = origin_lang_code.strip().lower()
 
         # ✅ 동아시아권이면 그대로 ("무라카미 하루키" 유지)
-        if code3 in east_asian_langs:
+        if code3 in _EAST_ASIAN_LANGS:
             return s
 
         # ✅ 서양권이면 "성, 이름"
-        if code3 in western_langs:
+        if code3 in _WESTERN_LANGS:
             parts = s.split()
             if len(parts) == 2:
                 return f"{parts[1]}, {parts[0]}"
@@ -1395,24 +1507,53 @@ _DEFAULT_LANGS = ["ja","zh","ru","en","ko"]
 _KOREAN_P27_QIDS = {"Q884","Q423","Q180"}
 _EAST_ASIAN_P27 = {"Q17","Q148","Q884","Q423","Q865","Q864","Q14773"}
 
+# QID → P27(국적) 목록: 단건/일괄 조회가 같이 쓰는 캐시 (응답을 받은 QID만 저장 → 실패는 다음에 재시도)
+_WD_P27_CACHE: dict[str, list[str]] = {}
+
+def _p27_ids(ent: dict) -> list[str]:
+    out = []
+    for stmt in (ent or {}).get("claims", {}).get("P27", []):
+        try:
+            out.append(stmt["mainsnak"]["datavalue"]["value"]["id"])
+        except Exception:
+            pass
+    return out
+
 def _wd_get_p27_list(qid: str) -> list[str]:
     if not qid:
         return []
+    cached = _WD_P27_CACHE.get(qid)
+    if cached is not None:
+        return cached
     try:
         r = SESSION.get(_WD_API, headers=_WD_UA, params={
             "action":"wbgetentities","ids":qid,"props":"claims","format":"json"
         }, timeout=(10,30))
         r.raise_for_status()
-        ent = r.json().get("entities", {}).get(qid, {})
-        out = []
-        for stmt in ent.get("claims", {}).get("P27", []):
-            try:
-                out.append(stmt["mainsnak"]["datavalue"]["value"]["id"])
-            except Exception:
-                pass
-        return out
+        out = _p27_ids(r.json().get("entities", {}).get(qid, {}))
     except Exception:
         return []
+    _WD_P27_CACHE[qid] = out
+    return out
+
+def _wd_get_p27_map(qids: list[str]) -> dict[str, list[str]]:
+    """여러 QID의 P27(국적)을 wbgetentities 한 번(최대 50개씩)으로 조회
+    (이름 해석 중 _wd_get_p27_list로 이미 받은 QID는 캐시에서, 나머지만 요청)"""
+    uniq = list(dict.fromkeys(q for q in qids if q))
+    missing = [q for q in uniq if q not in _WD_P27_CACHE]
+    for i in range(0, len(missing), 50):
+        chunk = missing[i:i + 50]
+        try:
+            r = SESSION.get(_WD_API, headers=_WD_UA, params={
+                "action":"wbgetentities","ids":"|".join(chunk),"props":"claims","format":"json"
+            }, timeout=(10,30))
+            r.raise_for_status()
+            ents = r.json().get("entities", {})
+        except Exception:
+            continue
+        for qid in chunk:
+            _WD_P27_CACHE[qid] = _p27_ids(ents.get(qid))
+    return {q: _WD_P27_CACHE.get(q, []) for q in uniq}
 
 def _wd_is_korean_national(qid: str) -> bool:
     return any(c in _KOREAN_P27_QIDS for c in _wd_get_p27_list(qid))
@@ -1546,6 +1687,9 @@ _ROMAN_KOREAN_SURNAMES = {
     "seo","suh","seoh","shin","sin","song","jeon","jun","cheon","chon","na","ra","ha",
 }
 
+_RE_FIRST_TOKEN_SEP = re.compile(r"[\s,]")
+_ASCII_LETTERS = frozenset(ascii_letters)
+
 def looks_romanized_korean_name(name: str) -> bool:
     """로마자 표기인데 한국 성으로 시작하면 한국인일 가능성이 높다고 본다."""
     s = (name or "").strip()
@@ -1556,8 +1700,8 @@ def looks_romanized_korean_name(name: str) -> bool:
         return False
 
     # 첫 토큰만 보고, 알파벳만 남김
-    first = re.split(r"[\s,]", s)[0]
-    first = re.sub(r"[^A-Za-z]", "", first).lower()
+    first = _RE_FIRST_TOKEN_SEP.split(s, 1)[0]
+    first = "".join(c for c in first if c in _ASCII_LETTERS).lower()
     if not first:
         return False
 
@@ -1584,8 +1728,24 @@ def build_90010_prefer_lod_then_wikidata_with_meta(people: dict, include_transla
 
     out, seen, trace = [], set(), []
 
+    # 1) 인명별 원어명 조회(LOD/Wikidata)는 서로 독립적이므로 동시에 수행 (순서는 names_all 유지)
+    uniq_names = list(dict.fromkeys(names_all))
+    if len(uniq_names) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(uniq_names))) as ex:
+            resolved = dict(zip(uniq_names, ex.map(resolve_original_name_prefer_lod, uniq_names)))
+    else:
+        resolved = {nm: resolve_original_name_prefer_lod(nm) for nm in uniq_names}
+
+    def _qid_of(prov):
+        if isinstance(prov, dict):
+            return prov.get("qid") or (prov.get("provenance") or {}).get("qid")
+        return None
+
+    # 2) 국적(P27)은 모인 QID 전체를 한 번에 조회
+    p27_map = _wd_get_p27_map([_qid_of(prov) for val, prov in resolved.values() if val])
+
     for nm in names_all:
-        val, prov = resolve_original_name_prefer_lod(nm)
+        val, prov = resolved[nm]
         role = "author" if nm in names_author else "translator"
 
         if not val:
@@ -1593,10 +1753,8 @@ def build_90010_prefer_lod_then_wikidata_with_meta(people: dict, include_transla
             continue
 
         # 국적 기반 필터링 (한국인 900 제외)
-        qid = None
-        if isinstance(prov, dict):
-            qid = prov.get("qid") or (prov.get("provenance") or {}).get("qid")
-        if qid and _wd_is_korean_national(qid):
+        qid = _qid_of(prov)
+        if qid and any(c in _KOREAN_P27_QIDS for c in p27_map.get(qid, [])):
             trace.append({"who": nm, "resolved": val, "role": role,
                           "provenance": {**(prov or {}), "filtered": "korean_p27"}})
             continue
@@ -1634,7 +1792,7 @@ def build_90010_from_wikidata(people: dict, include_translator: bool = True) ->
 def get_candidate_names_for_isbn(isbn: str) -> list[str]:
     """NLK/알라딘에서 각 1차 저자명(한글)을 뽑아 후보 리스트로 반환."""
     author_raw, _ = fetch_nlk_author_only(isbn)
-    item = fetch_aladin_item(isbn)
+    item = fetch_aladin_item_safe(isbn)
 
     # NLK 첫 저자
     nlk_first = ""
@@ -1804,9 +1962,7 @@ LIMIT 30
         data = _run_sparql(query_like)
 
     native, roman, countries = set(), set(), set()
-    has_cjk = lambda s: bool(re.search(r"[\u4E00-\u9FFF\u3040-\u30FF\uAC00-\uD7A3]", s))
-    has_cyr = lambda s: bool(re.search(r"[\u0400-\u04FF]", s))
-    has_lat = lambda s: bool(re.search(r"[A-Za-z]", s))
+    has_cjk, has_cyr, has_lat = _CJK_RX.search, _CYR_RX.search, _LAT_RX.search  # 모듈 수준에서 미리 컴파일된 패턴 (아래 _CJK_RX 등)
 
     for b in data.get("results", {}).get("bindings", []):
         c = b.get("country", {}).get("value", "")
@@ -1925,9 +2081,8 @@ SELECT DISTINCT ?name ?jaLabel ?zhLabel ?koLabel ?ruLabel ?enLabel ?nativeName ?
         if ru: grouped[key]["native"].add(ru)
 
         if nn:
-            if re.search(r"[\u4E00-\u9FFF\u3040-\u30FF\uAC00-\uD7A3]", nn): grouped[key]["native"].add(nn)
-            elif re.search(r"[\u0400-\u04FF]", nn): grouped[key]["native"].add(nn)
-            elif re.search(r"[A-Za-z]", nn): grouped[key]["roman"].add(nn)
+            if _CJK_RX.search(nn) or _CYR_RX.search(nn): grouped[key]["native"].add(nn)
+            elif _LAT_RX.search(nn): grouped[key]["roman"].add(nn)
 
         if en:
             grouped[key]["roman"].add(en)
@@ -1944,6 +2099,7 @@ SELECT DISTINCT ?name ?jaLabel ?zhLabel ?koLabel ?ruLabel ?enLabel ?nativeName ?
 
 _CJK_RX = re.compile(r"[\u4E00-\u9FFF\u3040-\u30FF\uAC00-\uD7A3]")  # 한자/가나/한글
 _CYR_RX = re.compile(r"[\u0400-\u04FF]")  # 키릴
+_LAT_RX = re.compile(r"[A-Za-z]")          # 라틴
 
 def reorder_western_like_name(name: str) -> str:
     """
@@ -2005,12 +2161,14 @@ def build_90010_from_lod(people: dict, include_translator: bool = True) -> list[
 # =========================
 DELIMS = [": ", " : ", ":", " - ", " — ", "–", "—", "-", " · ", "·", "; ", ";", " | ", "|", "/"]
 
+_RE_FORMAT_CTRL = re.compile(r"[\u2000-\u200f\u202a-\u202e]")
+
 def _compat_normalize(s: str) -> str:
     if not s:
         return ""
     s = s.replace("：", ":").replace("－", "-").replace("‧", "·").replace("／", "/")
-    s = re.sub(r"[\u2000-\u200f\u202a-\u202e]", "", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _RE_FORMAT_CTRL.sub("", s)
+    s = _RE_WS.sub(" ", s).strip()
     return s
 
 _TRAIL_PAREN_PAT = re.compile(
@@ -2106,6 +2264,16 @@ _PART_LABEL_RX = re.compile(
     re.IGNORECASE
 )
 
+# 245 $a 끝 권차 분리용
+_RE_ENDS_WITH_DIGIT = re.compile(r"\d\s*$")
+_RE_NUMERIC_TITLE = re.compile(r"\d+|[IVXLCDM]+", re.IGNORECASE)
+_RE_PART_PAREN = re.compile(r"\s*[\(\[]\s*([^()\[\]]+)\s*[\)\]]\s*$")
+_RE_PART_LABEL_TAIL = re.compile(r"\s*(제?\s*\d+\s*(?:권|부|편|책))\s*$", re.IGNORECASE)
+_RE_PART_KOR_TAIL = re.compile(r"\s*([상중하]|[전후])\s*$")
+_RE_PART_ROMAN_TAIL = re.compile(r"\s*([IVXLCDM]+)\s*$", re.IGNORECASE)
+_RE_PART_NUM_TAIL = re.compile(r"\s*(\d{1,3})\s*$")
+_RE_DIGITS = re.compile(r"\d+")
+
 def _has_series_evidence(item: dict) -> bool:
     """시리즈/원제 등 권차 가능성 보강 신호"""
     series = item.get("seriesInfo") or {}
@@ -2115,7 +2283,7 @@ def _has_series_evidence(item: dict) -> bool:
         return True
     # 원제가 있고, 원제는 숫자로 끝나지 않는데 한글제목만 숫자로 끝나면 권차 가능성↑
     orig = (sub.get("originalTitle") or "").strip()
-    if orig and not re.search(r"\d\s*$", orig):
+    if orig and not _RE_ENDS_WITH_DIGIT.search(orig):
         return True
     return False
 
@@ -2129,33 +2297,33 @@ def _split_part_suffix_for_245(a_raw: str, item: dict) -> tuple[str, str|None]:
 
     a = _clean_piece(a_raw)  # 네가 이미 쓰고 있는 정리 함수
     # (1) 전부 숫자/로마숫자인 제목은 '숫자 제목'으로 보고 분리하지 않음 (예: '1984')
-    if re.fullmatch(r"\d+|[IVXLCDM]+", a, re.IGNORECASE):
+    if _RE_NUMERIC_TITLE.fullmatch(a):
         return a, None
 
     # (2) '... (제1권)' 같은 괄호형 권차 → 우선 처리
-    m_paren = re.search(r"\s*[\(\[]\s*([^()\[\]]+)\s*[\)\]]\s*$", a)
+    m_paren = _RE_PART_PAREN.search(a)
     if m_paren and _PART_LABEL_RX.search(m_paren.group(1).strip()):
         n_token = m_paren.group(1).strip()
         a_base  = a[: m_paren.start()].rstrip(" .,/;:-—·|")
         # '제1권'은 숫자만 남겨 주는 게 깔끔
-        m_num = re.search(r"\d+", n_token)
+        m_num = _RE_DIGITS.search(n_token)
         return a_base, (m_num.group(0) if m_num else n_token)
 
     # (3) 라벨형 권차(붙은 형태 포함): '... 제1권' / '... 1권' / '... 1부' / '...1편'
-    m_label = re.search(r"\s*(제?\s*\d+\s*(?:권|부|편|책))\s*$", a, re.IGNORECASE)
+    m_label = _RE_PART_LABEL_TAIL.search(a)
     if m_label:
         a_base = a[: m_label.start()].rstrip(" .,/;:-—·|")
-        num    = re.search(r"\d+", m_label.group(1))
+        num    = _RE_DIGITS.search(m_label.group(1))
         return a_base, (num.group(0) if num else m_label.group(1).strip())
 
     # (4) 상/중/하, 전/후
-    m_kor = re.search(r"\s*([상중하]|[전후])\s*$", a)
+    m_kor = _RE_PART_KOR_TAIL.search(a)
     if m_kor:
         a_base = a[: m_kor.start()].rstrip(" .,/;:-—·|")
         return a_base, m_kor.group(1)
 
     # (5) 로마숫자 (I, II, III, …)
-    m_roman = re.search(r"\s*([IVXLCDM]+)\s*$", a, re.IGNORECASE)
+    m_roman = _RE_PART_ROMAN_TAIL.search(a)
     if m_roman:
         a_base = a[: m_roman.start()].rstrip(" .,/;:-—·|")
         token  = m_roman.group(1)
@@ -2163,7 +2331,7 @@ def _split_part_suffix_for_245(a_raw: str, item: dict) -> tuple[str, str|None]:
         return a_base, token
 
     # (6) 맨 끝 '맨바로 숫자' — 과대 분리 방지 위해 '시리즈/원제' 같은 보강 신호가 있을 때만
-    m_tailnum = re.search(r"\s*(\d{1,3})\s*$", a)
+    m_tailnum = _RE_PART_NUM_TAIL.search(a)
     if m_tailnum and _has_series_evidence(item):
         a_base = a[: m_tailnum.start()].rstrip(" .,/;:-—·|")
         # '파이썬 3' 같은 '판/개정'은 뒤에 '판/쇄/ed'가 붙는 경우가 많아 여기엔 안 걸림
@@ -2173,12 +2341,17 @@ def _split_part_suffix_for_245(a_raw: str, item: dict) -> tuple[str, str|None]:
     # (7) 분리 못 하면 그대로
     return a, None
 
+# 245 $a 구두점 정리 / $a·$n 추출
+_RE_SPACE_BEFORE_PUNCT = re.compile(r"\s+([:;,./])")
+_RE_TRAILING_PUNCT = re.compile(r"[.:;,/]\s*$")
+_RE_245_A = re.compile(r"=245\s+\d{2}\$a(.*?)(?=\$[a-z]|$)")
+_RE_245_N = re.compile(r"\$n(.*?)(?=\$[a-z]|$)")
+
 def get_title_a_from_aladin(item: dict) -> str:
     # 245 $a로 쓰는 본표제만 (부제 제외) — 245 빌더와 동일 정리 규칙
-    import re
     t = ((item or {}).get("title") or "").strip()
-    t = re.sub(r"\s+([:;,./])", r"\1", t).strip()
-    t = re.sub(r"[.:;,/]\s*$", "", t).strip()
+    t = _RE_SPACE_BEFORE_PUNCT.sub(r"\1", t).strip()
+    t = _RE_TRAILING_PUNCT.sub("", t).strip()
     return t
 
 def parse_245_a_n(marc245_line: str) -> tuple[str, str | None]:
@@ -2192,15 +2365,15 @@ def parse_245_a_n(marc245_line: str) -> tuple[str, str | None]:
         return "", None
 
     # $a 추출
-    m_a = re.search(r"=245\s+\d{2}\$a(.*?)(?=\$[a-z]|$)", marc245_line)
+    m_a = _RE_245_A.search(marc245_line)
     a_out = (m_a.group(1).strip() if m_a else "").strip()
 
     # $a 끝의 불필요한 구두점 정리 (.,:;/ 공백)
-    a_out = re.sub(r"\s+([:;,./])", r"\1", a_out)
-    a_out = re.sub(r"[.:;,/]\s*$", "", a_out).strip()
+    a_out = _RE_SPACE_BEFORE_PUNCT.sub(r"\1", a_out)
+    a_out = _RE_TRAILING_PUNCT.sub("", a_out).strip()
 
     # $n 추출 (있으면 숫자 읽기 금지에 쓰임)
-    m_n = re.search(r"\$n(.*?)(?=\$[a-z]|$)", marc245_line)
+    m_n = _RE_245_N.search(marc245_line)
     n_val = m_n.group(1).strip() if m_n else None
 
     return a_out, n_val if n_val else None
@@ -2263,8 +2436,9 @@ def build_nlk_url_json(isbn: str, page_no: int = 1, page_size: int = 1) -> str:
     })
     return f"{base}?{qs}"
 
+@st.cache_data(ttl=24*3600, show_spinner=False)
 def fetch_nlk_seoji_json(isbn: str):
-    """다중 엔드포인트 순차 시도 → (첫 성공) (레코드, 실제 URL) 반환"""
+    """다중 엔드포인트 순차 시도 → (첫 성공) (레코드, 실제 URL) 반환 (실패는 예외로 올려 캐시하지 않음)"""
     if not NLK_CERT_KEY:
         raise RuntimeError("NLK_CERT_KEY 미설정")
 
@@ -2283,7 +2457,7 @@ def fetch_nlk_seoji_json(isbn: str):
         try:
             r = SESSION.get(base, params=params, timeout=(10, 30))
             r.raise_for_status()
-            data = r.json()
+            data = _json_loads(r.content)
             docs = data.get("docs") or data.get("DOCS") or []
             if docs:
                 return docs[0], r.url
@@ -2301,7 +2475,9 @@ def fetch_nlk_author_only(isbn: str):
     except Exception:
         return "", build_nlk_url_json(isbn)
 
+@st.cache_data(ttl=24*3600, show_spinner=False)
 def fetch_aladin_item(isbn13: str) -> dict:
+    """알라딘 ItemLookUp 첫 item (일괄 prewarm 후 건별 처리에서 재요청 안 함, 실패는 캐시하지 않음)"""
     if not ALADIN_TTB_KEY:
         raise RuntimeError("ALADIN_TTB_KEY 미설정")
     url = "http://www.aladin.co.kr/ttb/api/ItemLookUp.aspx"
@@ -2311,8 +2487,22 @@ def fetch_aladin_item(isbn13: str) -> dict:
     }
     r = SESSION.get(url, params=params, timeout=(5, 20))
     r.raise_for_status()
-    data = r.json()
-    return (data.get("item") or [{}])[0]
+    data = _json_loads(r.content)
+    # 알라딘은 쿼터/키/조회 오류도 HTTP 200 + errorCode로 돌려줌 → 예외로 올려 캐시에 남기지 않음
+    if not isinstance(data, dict) or data.get("errorCode"):
+        raise RuntimeError(f"알라딘 ItemLookUp 오류: {(data or {}).get('errorMessage') if isinstance(data, dict) else data!r}")
+    items = data.get("item") or []
+    if not items:
+        raise LookupError(f"알라딘 ItemLookUp 결과 없음: {isbn13}")
+    return items[0]
+
+def fetch_aladin_item_safe(isbn13: str) -> dict:
+    """fetch_aladin_item의 비캐시 래퍼: 오류/결과 없음은 {} (캐시되지 않으므로 다음 호출에서 재시도)"""
+    try:
+        return fetch_aladin_item(isbn13)
+    except Exception as e:
+        dbg_err(f"[알라딘] ItemLookUp 실패 isbn={isbn13}: {e}")
+        return {}
 
 
 # === 940: AI 보강 ===
@@ -2339,7 +2529,8 @@ def _ai940_set(key: str, value: list[str]):
 
 def ai_korean_readings(title: str, n: int = 4) -> List[str]:
     title = (title or "").strip()
-    if not title or _client is None:
+    client = _get_ai_client()
+    if not title or client is None:
         return []
 
     key = f"ai940|{title}"
@@ -2358,7 +2549,7 @@ def ai_korean_readings(title: str, n: int = 4) -> List[str]:
             "지침: 표기는 한국어로만, 맞춤법 준수. "
             "예: 2025→이천이십오, 2.0→이점영, ChatGPT→챗지피티"
         )
-        resp = _client.chat.completions.create(
+        resp = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[{"role":"system","content":sys},
                       {"role":"user","content":prompt}],
@@ -2472,19 +2663,21 @@ def generate_korean_title_variants(title: str, max_variants: int = 5) -> List[st
     outs = []
     for v in variants:
         if not v: continue
-        v = re.sub(r"\s+([:;,./])", r"\1", v).strip()
+        v = _RE_SPACE_BEFORE_PUNCT.sub(r"\1", v).strip()
         outs.append(v)
     outs = sorted(set(outs), key=lambda s: (len(s), s))
     return outs[:max_variants]
 
-def build_940_from_title_a(title_a: str, use_ai: bool = True, *, disable_number_reading: bool = False) -> list[str]:
-    import re
+_RE_ASCII_ALNUM = re.compile(r"[0-9A-Za-z]")
+
+def build_940_from_title_a(title_a: str, use_ai: bool = True, *, disable_number_reading: bool = False) -> list[tuple]:
+    """245 $a의 숫자/영문 읽기 변형 → 940 (Field, MRK) 쌍 목록 (최대 6개)"""
     base = (title_a or "").strip()
     if not base:
         return []
 
     # 숫자/영문 없으면 생성 생략
-    if not re.search(r"[0-9A-Za-z]", base):
+    if not _RE_ASCII_ALNUM.search(base):
         return []
 
     # 규칙 기반
@@ -2515,7 +2708,7 @@ def build_940_from_title_a(title_a: str, use_ai: bool = True, *, disable_number_
             continue
         if v not in seen:
             seen.add(v)
-            out.append(f"=940  \\\\$a{v}")
+            out.append(_a_field_pair("940", " ", " ", v))
     return out[:6]
 
 def ai_korean_readings_strict(title_a: str, n: int = 4) -> list[str]:
@@ -2524,7 +2717,8 @@ def ai_korean_readings_strict(title_a: str, n: int = 4) -> list[str]:
     - 부제/추가 단어/콜론/대시 추가 금지
     """
     import re
-    if not title_a or _client is None:
+    client = _get_ai_client()
+    if not title_a or client is None:
         return []
 
     key = f"ai940|strict|{title_a}"
@@ -2543,7 +2737,7 @@ def ai_korean_readings_strict(title_a: str, n: int = 4) -> list[str]:
             f"본표제(245 $a): {title_a}\n"
             "예: 2025→이천이십오, 2.0→이점영, ChatGPT→챗지피티"
         )
-        resp = _client.chat.completions.create(
+        resp = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[{"role":"system","content":sys},
                       {"role":"user","content":prompt}],
@@ -2567,9 +2761,9 @@ def ai_korean_readings_strict(title_a: str, n: int = 4) -> list[str]:
 
 
 
-def build_049(reg_mark: str, reg_no: str, copy_symbol: str) -> str:
+def build_049(reg_mark: str, reg_no: str, copy_symbol: str) -> tuple:
     """
-    049 소장사항 필드 생성
+    049 소장사항 필드 생성 → (Field, MRK)
     - $I 등록기호+등록번호
     - $f 별치기호 (있을 때만)
     """
@@ -2577,25 +2771,22 @@ def build_049(reg_mark: str, reg_no: str, copy_symbol: str) -> str:
     reg_no = (reg_no or "").strip()
     copy_symbol = (copy_symbol or "").strip()
 
-    if not (reg_mark or reg_no):
-        field = "=049  0\\$lEMQ999999"  # 등록기호+등록번호 없으면 생성 안 함 > EMQ999999 출력
-        if copy_symbol:
-            field += f"$f{copy_symbol}"
-        return field
-
-    field = f"=049  0\\$l{reg_mark}{reg_no}"
+    # 등록기호+등록번호 없으면 생성 안 함 > EMQ999999 출력
+    subs = [("l", f"{reg_mark}{reg_no}" if (reg_mark or reg_no) else "EMQ999999")]
     if copy_symbol:
-        field += f"$f{copy_symbol}"
-    return field
+        subs.append(("f", copy_symbol))
+    return make_field("049", "0", " ", subs)
 
 # =========================
 # 👤 NLK AUTHOR → 저자/역자 분리 & 700
 # =========================
 
+_RE_041_H_LANG = re.compile(r"\$h([a-z]{3})", re.IGNORECASE)
+
 def _extract_lang_h_from_041(tag_041_text: str | None) -> str | None:
     if not tag_041_text:
         return None
-    m = re.search(r"\$h([a-z]{3})", tag_041_text, re.IGNORECASE)
+    m = _RE_041_H_LANG.search(tag_041_text)
     return m.group(1).lower() if m else None
 
 # 사람 단위 분할(세미콜론은 그룹 분리로 다룸)
@@ -2618,42 +2809,45 @@ ROLE_AUTHOR_TRAIL = (
 )
 ROLE_TRANS_TRAIL = r"(?:옮김|번역|번역자|역자|역|역해|역주|공역)"
 
+# split_authors_translators 용 정규식 (호출마다 rf-문자열 조립/캐시 조회 방지)
+_RE_ROLE_PAREN = re.compile(rf"\(\s*({ROLE_AUTHOR_LABELS}|{ROLE_TRANS_LABELS})\s*\)", re.IGNORECASE)
+_RE_ROLE_GROUP_SEP = re.compile(r"\s*;\s*")
+_RE_ROLE_LABELED = re.compile(
+    rf"(?P<label>{ROLE_AUTHOR_LABELS}|{ROLE_TRANS_LABELS})\s*:\s*(?P<names>.+)$", re.IGNORECASE
+)
+_RE_AUTHOR_LABEL_HEAD = re.compile(ROLE_AUTHOR_LABELS, re.IGNORECASE)
+# '말미 역할' 또는 '라벨 포함'을 한 번의 search로 판정
+_RE_IS_AUTHOR = re.compile(rf"\s+{ROLE_AUTHOR_TRAIL}$|{ROLE_AUTHOR_LABELS}", re.IGNORECASE)
+_RE_IS_TRANS = re.compile(rf"\s+{ROLE_TRANS_TRAIL}$|{ROLE_TRANS_LABELS}", re.IGNORECASE)
+_RE_TRAILING_ROLE = re.compile(
+    rf"\s+(?:{ROLE_AUTHOR_TRAIL}|{ROLE_TRANS_TRAIL})\s*[\)\].,;:]*$", re.IGNORECASE
+)
+
 def _strip_trailing_role(piece: str) -> str:
-    return re.sub(
-        rf"\s+(?:{ROLE_AUTHOR_TRAIL}|{ROLE_TRANS_TRAIL})\s*[\)\].,;:]*$",
-        "", piece, flags=re.IGNORECASE
-    ).strip()
+    return _RE_TRAILING_ROLE.sub("", piece).strip()
 
 def split_authors_translators(nlk_author_raw: str):
     """AUTHOR 문자열을 저자/역자 리스트로 분리"""
     if not nlk_author_raw:
         return [], []
-    s = re.sub(r"\s+", " ", nlk_author_raw.strip())
+    s = _RE_WS.sub(" ", nlk_author_raw.strip())
     # 괄호형 역할 → 말미 노출
-    s = re.sub(
-        rf"\(\s*({ROLE_AUTHOR_LABELS}|{ROLE_TRANS_LABELS})\s*\)",
-        lambda m: " " + m.group(1), s, flags=re.IGNORECASE
-    )
+    s = _RE_ROLE_PAREN.sub(lambda m: " " + m.group(1), s)
     authors, translators = [], []
-    groups = [g.strip() for g in re.split(r"\s*;\s*", s) if g.strip()]
+    groups = [g.strip() for g in _RE_ROLE_GROUP_SEP.split(s) if g.strip()]
     for g in groups:
         # 레이블형
-        m_lab = re.match(
-            rf"(?P<label>{ROLE_AUTHOR_LABELS}|{ROLE_TRANS_LABELS})\s*:\s*(?P<names>.+)$",
-            g, flags=re.IGNORECASE
-        )
+        m_lab = _RE_ROLE_LABELED.match(g)
         if m_lab:
             label = m_lab.group("label"); names_part = m_lab.group("names")
             parts = [p.strip() for p in SEP_PATTERN.split(names_part) if p.strip()]
-            (authors if re.match(ROLE_AUTHOR_LABELS, label, re.IGNORECASE) else translators).extend(parts)
+            (authors if _RE_AUTHOR_LABEL_HEAD.match(label) else translators).extend(parts)
             continue
         # 말미형/무표시
         chunks = [p.strip() for p in SEP_PATTERN.split(g) if p.strip()]
         for ch in chunks:
-            is_author = bool(re.search(rf"\s+{ROLE_AUTHOR_TRAIL}$", ch, re.IGNORECASE) or
-                             re.search(ROLE_AUTHOR_LABELS, ch, re.IGNORECASE))
-            is_trans  = bool(re.search(rf"\s+{ROLE_TRANS_TRAIL}$", ch, re.IGNORECASE) or
-                             re.search(ROLE_TRANS_LABELS, ch, re.IGNORECASE))
+            is_author = bool(_RE_IS_AUTHOR.search(ch))
+            is_trans  = bool(_RE_IS_TRANS.search(ch))
             base = _strip_trailing_role(ch)
             if is_author and not is_trans:
                 authors.append(base)
@@ -2666,20 +2860,25 @@ def split_authors_translators(nlk_author_raw: str):
     seen = set(); translators = [x for x in translators if not (x in seen or seen.add(x))]
     return authors, translators
 
+ROLE_ANY_LABELS = rf"(?:{ROLE_AUTHOR_LABELS}|{ROLE_TRANS_LABELS})"
+ROLE_ANY_TRAIL  = rf"(?:{ROLE_AUTHOR_TRAIL}|{ROLE_TRANS_TRAIL})"
+# '라벨:' / '(라벨)' / ' 말미역할' 세 형태를 하나의 대안 정규식으로 결합
+_ROLE_ANY_STRIP_RE = re.compile(
+    rf"{ROLE_ANY_LABELS}\s*:\s*"
+    rf"|\(\s*{ROLE_ANY_LABELS}\s*\)"
+    rf"|\s+{ROLE_ANY_TRAIL}(?=$|[\s),.;/|])",
+    re.IGNORECASE,
+)
+
 def parse_nlk_authors(nlk_author_raw: str):
     """역할어 제거 후, 사람 이름만(저자/역자 합쳐서) 리스트로 추출 → 700 생성용"""
     if not nlk_author_raw:
         return []
-    s = nlk_author_raw
-    ROLE_ANY_LABELS = rf"(?:{ROLE_AUTHOR_LABELS}|{ROLE_TRANS_LABELS})"
-    ROLE_ANY_TRAIL  = rf"(?:{ROLE_AUTHOR_TRAIL}|{ROLE_TRANS_TRAIL})"
-    # 레이블형/괄호형/말미형 역할어 제거
-    s = re.sub(rf"{ROLE_ANY_LABELS}\s*:\s*", "", s, flags=re.IGNORECASE)
-    s = re.sub(rf"\(\s*{ROLE_ANY_LABELS}\s*\)", "", s, flags=re.IGNORECASE)
-    s = re.sub(rf"\s+{ROLE_ANY_TRAIL}(?=$|[\s),.;/|])", "", s, flags=re.IGNORECASE)
+    # 레이블형/괄호형/말미형 역할어 제거 (한 번의 스캔)
+    s = _ROLE_ANY_STRIP_RE.sub("", nlk_author_raw)
     # 사람 단위 분리
     chunks = [c for c in SEP_PATTERN.split(s) if c and c.strip()]
-    return [re.sub(r"\s+", " ", c).strip() for c in chunks]
+    return [_RE_WS.sub(" ", c).strip() for c in chunks]
 
 def build_700_from_nlk_author(nlk_author_raw: str, *, aladin_item: dict | None = None):
     authors, translators = split_authors_translators(nlk_author_raw)
@@ -2695,6 +2894,21 @@ def build_700_from_nlk_author(nlk_author_raw: str, *, aladin_item: dict | None =
 # ===============================
 # 245 필드 구성 (제목 / 책임표시)
 # ===============================
+# 245 책임표시: 이름 뒤에 남은 역할 괄호 표기 제거
+_245_AUTHOR_LABELS = ("(지은이)", "(저자)")
+_245_EDITOR_LABELS = ("(엮은이)", "(편집)", "(편저)")
+_245_ILLUS_LABELS  = ("(그림)", "(그린이)", "(일러스트)", "(삽화)")
+_245_TRANS_LABELS  = ("(옮긴이)", "(역자)", "(번역)")
+
+def _strip_245_role_labels(names, labels) -> list[str]:
+    result = []
+    for name in names:
+        if "(" in name:  # 괄호가 없으면 replace 생략
+            for w in labels:
+                name = name.replace(w, "")
+        result.append(name.strip())
+    return result
+
 def build_245_with_people_from_sources(aladin_item: dict, nlk_author_raw: str, prefer="aladin") -> str:
     tb = extract_245_from_aladin_item(aladin_item, collapse_a_spaces=False)
     a_out, b, n = tb["a"], tb.get("b"), tb.get("n")
@@ -2720,19 +2934,10 @@ def build_245_with_people_from_sources(aladin_item: dict, nlk_author_raw: str, p
         trans   = parsed.get("translator", [])
 
     # --- 이름 정리 ---
-    def clean_name_list(names, remove_words):
-        result = []
-        for name in names:
-            clean = name
-            for w in remove_words:
-                clean = clean.replace(w, "")
-            result.append(clean.strip())
-        return result
-
-    authors = clean_name_list(authors, ["(지은이)", "(저자)"])
-    edtrs   = clean_name_list(edtrs, ["(엮은이)", "(편집)", "(편저)"])
-    illus   = clean_name_list(illus, ["(그림)", "(그린이)", "(일러스트)", "(삽화)"])
-    trans   = clean_name_list(trans, ["(옮긴이)", "(역자)", "(번역)"])
+    authors = _strip_245_role_labels(authors, _245_AUTHOR_LABELS)
+    edtrs   = _strip_245_role_labels(edtrs, _245_EDITOR_LABELS)
+    illus   = _strip_245_role_labels(illus, _245_ILLUS_LABELS)
+    trans   = _strip_245_role_labels(trans, _245_TRANS_LABELS)
 
     # --- 파트 조립 ---
     parts = []
@@ -2817,6 +3022,8 @@ _ROLE_SUFFIX_RX = re.compile(r"\s*(지음|지은이|엮음|옮김|역|편|글|
 def _strip_role_suffix(s: str) -> str:
     return _ROLE_SUFFIX_RX.sub("", (s or "").strip())
 
+_RE_TRAILING_PAREN_GROUP = re.compile(r"\s*\(.*?\)\s*$")
+
 def extract_primary_author_ko_from_aladin(item: dict) -> str:
     """
     알라딘 item에서 '첫 저자(지은이)' 한글 표기를 추출한다.
@@ -2848,7 +3055,7 @@ def extract_primary_author_ko_from_aladin(item: dict) -> str:
     if author_str:
         first_seg = author_str.split(",")[0]
         # 끝의 "(역자)" "(지은이)" 등 괄호 역할 제거
-        first = re.sub(r"\s*\(.*?\)\s*$", "", first_seg).strip()
+        first = _RE_TRAILING_PAREN_GROUP.sub("", first_seg).strip()
         # 역할 꼬리표(지음/옮김 등) 제거
         first = _strip_role_suffix(first)
         return first
@@ -2945,12 +3152,20 @@ KR_REGION_TO_CODE = {
     "경남": "gnk", "경상남도": "gnk",
     "제주": "jjk", "제주특별자치도": "jjk",
 }
+# 3자리 코드는 레코드마다 008 조립·비교에 쓰이므로 intern해 동일 객체를 공유
+KR_REGION_TO_CODE = {k: sys.intern(v) for k, v in KR_REGION_TO_CODE.items()}
+
+# 지역명 전체를 하나의 정규식으로 묶어 한 번의 스캔으로 검색 (긴 이름 우선: "서울특별시" > "서울")
+_KR_REGION_RE = re.compile(
+    "|".join(re.escape(k) for k in sorted(KR_REGION_TO_CODE, key=len, reverse=True))
+)
 
 # 기본값: 발행국/언어/목록전거
-COUNTRY_FIXED = "ulk"   # 발행국 기본값
-LANG_FIXED    = "kor"   # 언어 기본값
+COUNTRY_FIXED = sys.intern("ulk")   # 발행국 기본값
+LANG_FIXED    = sys.intern("kor")   # 언어 기본값
 
 # 008 본문(40자) 조립기 — 단행본 기준(type_of_date 기본 's')
+@lru_cache(maxsize=1024)  # 입력이 모두 짧은 문자열 → 일괄 처리 시 같은 조합(날짜/발행지/언어…)은 재사용
 def build_008_kormarc_bk(
     date_entered,          # 00-05 YYMMDD
     date1,                 # 07-10 4자리(예: '2025' / '19uu')
@@ -2965,84 +3180,123 @@ def build_008_kormarc_bk(
     modified_record=" ",   # 28
     cataloging_src="a",    # 32  ← 기본값 'a'
 ):
-    def pad(s, n, fill=" "):
-        s = "" if s is None else str(s)
-        return (s[:n] + fill * n)[:n]
-
     if len(date_entered) != 6 or not date_entered.isdigit():
         raise ValueError("date_entered는 YYMMDD 6자리 숫자여야 합니다.")
     if len(date1) != 4:
         raise ValueError("date1은 4자리여야 합니다. 예: '2025', '19uu'")
 
-    body = "".join([
-        date_entered,               # 00-05
-        pad(type_of_date,1),        # 06
-        date1,                      # 07-10
-        pad(date2,4),               # 11-14
-        pad(country3,3),            # 15-17
-        pad(illus4,4),              # 18-21
-        " " * 4,                    # 22-25 (이용대상/자료형태/내용형식) 공백
-        " " * 2,                    # 26-27 공백
-        pad(modified_record,1),     # 28
-        "0",                        # 29 회의간행물
-        "0",                        # 30 기념논문집
-        has_index if has_index in ("0","1") else "0",  # 31 색인
-        pad(cataloging_src,1),      # 32 목록 전거
-        pad(lit_form,1),            # 33 문학형식
-        pad(bio,1),                 # 34 전기
-        pad(lang3,3),               # 35-37 언어
-        " " * 2                     # 38-39 (정부기관부호 등) 공백
-    ])
-    if len(body) != 40:
-        raise AssertionError(f"008 length != 40: {len(body)}")
+    # None → "" 후 포맷 지정자(<n.n)로 자르기+공백 채우기를 한 번에 처리
+    type_of_date, date2, country3, illus4, modified_record, cataloging_src, lit_form, bio, lang3 = (
+        "" if v is None else str(v)
+        for v in (type_of_date, date2, country3, illus4, modified_record, cataloging_src, lit_form, bio, lang3)
+    )
+    idx = has_index if has_index in ("0","1") else "0"
+
+    body = (
+        f"{date_entered}"           # 00-05
+        f"{type_of_date:<1.1}"      # 06
+        f"{date1}"                  # 07-10
+        f"{date2:<4.4}"             # 11-14
+        f"{country3:<3.3}"          # 15-17
+        f"{illus4:<4.4}"            # 18-21
+        "    "                      # 22-25 (이용대상/자료형태/내용형식) 공백
+        "  "                        # 26-27 공백
+        f"{modified_record:<1.1}"   # 28
+        "0"                         # 29 회의간행물
+        "0"                         # 30 기념논문집
+        f"{idx}"                    # 31 색인
+        f"{cataloging_src:<1.1}"    # 32 목록 전거
+        f"{lit_form:<1.1}"          # 33 문학형식
+        f"{bio:<1.1}"               # 34 전기
+        f"{lang3:<3.3}"             # 35-37 언어
+        "  "                        # 38-39 (정부기관부호 등) 공백
+    )
+    # 가변 입력은 위에서 길이 검증(00-05, 07-10) 또는 <n.n 로 고정폭 → 항상 40자라 재검사 생략
     return body
 
+_RE_PUB_YEAR = re.compile(r"(19|20)\d{2}")
+
 # 발행연도 추출(알라딘 pubDate 우선)
 def extract_year_from_aladin_pubdate(pubdate_str: str) -> str:
-    m = re.search(r"(19|20)\d{2}", pubdate_str or "")
+    m = _RE_PUB_YEAR.search(pubdate_str or "")
     return m.group(0) if m else "19uu"
 
 # 300 발행지 문자열 → country3 추론
 def guess_country3_from_place(place_str: str) -> str:
     if not place_str:
         return COUNTRY_FIXED
-    for key, code in KR_REGION_TO_CODE.items():
-        if key in place_str:
-            return code
+    m = _KR_REGION_RE.search(place_str)
+    if m:
+        return KR_REGION_TO_CODE[m.group(0)]
     # 한국 일반코드("ko ")는 사용하지 않으므로, 기본값으로 통일
     return COUNTRY_FIXED
 
 
 # ====== 단어 감지 ======
+# 008 감지 키워드 전체를 이름붙은 그룹 하나의 정규식으로 묶어 본문을 한 번만 훑음
+# - 그룹 순서 = 감지기 안의 우선순위
+# - 전방탐색(?=...)이라 매치가 글자를 소비하지 않음 → '삽화보'처럼 겹친 키워드도 모두 잡힘
+_DETECT_008_GROUPS = (
+    # 18-21 삽화표시 — a: 삽화/일러스트/그림, d: 도표/그래프/차트, o: 사진/화보
+    ("illus_a", r"삽화|삽도|도해|일러스트|일러스트레이션|그림|illustration"),
+    ("illus_d", r"도표|표|차트|그래프|chart|graph"),
+    ("illus_o", r"사진|포토|화보|photo|photograph|컬러사진|칼라사진"),
+    # 31 색인
+    ("idx", r"색인|찾아보기|인명색인|사항색인|index"),
+    # 33 문학형식
+    ("lit_i", r"서간집|편지|서간문|letters?"),                       # 서간문학
+    ("lit_m", r"기행|여행기|여행 에세이|일기|수기|diary|travel"),     # 기행/일기/수기
+    ("lit_p", r"시집|산문시|poem|poetry"),                          # 시
+    ("lit_f", r"소설|장편|중단편|novel|fiction"),                    # 소설
+    ("lit_e", r"에세이|수필|essay"),                                # 수필
+    # 34 전기
+    ("bio_a", r"자서전|회고록|autobiograph"),
+    ("bio_b", r"전기|평전|인물 평전|biograph"),
+    ("bio_d", r"전기적|자전적|회고|회상"),
+)
+
+def _compile_detect(prefix: str = "") -> re.Pattern:
+    alts = "|".join(f"(?P<{name}>{pat})" for name, pat in _DETECT_008_GROUPS if name.startswith(prefix))
+    return re.compile(f"(?=(?:{alts}))", re.I)
+
+_RE_DETECT_008 = _compile_detect()
+_RE_ILLUS = _compile_detect("illus_")
+_RE_INDEX = _compile_detect("idx")
+_RE_LIT_FORM = _compile_detect("lit_")
+_RE_BIO = _compile_detect("bio_")
+
+def _scan_groups(rx: re.Pattern, *texts: str) -> set:
+    """texts를 차례로 한 번씩 훑어 등장한 그룹명 집합 반환 (문자열 결합 없이)"""
+    found = set()
+    for t in texts:
+        if t:
+            found.update(m.lastgroup for m in rx.finditer(t))
+    return found
+
+def _illus4_from(found: set) -> str:
+    return "".join(k for k in "ado" if f"illus_{k}" in found)[:4]
+
+def _index_from(found: set) -> str:
+    return "1" if "idx" in found else "0"
+
+def _lit_form_from(found: set) -> str:
+    return next((k for k in "impfe" if f"lit_{k}" in found), " ")
+
+def _bio_from(found: set) -> str:
+    return next((k for k in "abd" if f"bio_{k}" in found), " ")
+
 def detect_illus4(text: str) -> str:
-    # a: 삽화/일러스트/그림, d: 도표/그래프/차트, o: 사진/화보
-    keys = []
-    if re.search(r"삽화|삽도|도해|일러스트|일러스트레이션|그림|illustration", text, re.I): keys.append("a")
-    if re.search(r"도표|표|차트|그래프|chart|graph", text, re.I):                          keys.append("d")
-    if re.search(r"사진|포토|화보|photo|photograph|컬러사진|칼라사진", text, re.I):          keys.append("o")
-    out = []
-    for k in keys:
-        if k not in out:
-            out.append(k)
-    return "".join(out)[:4]
+    return _illus4_from(_scan_groups(_RE_ILLUS, text))
 
 def detect_index(text: str) -> str:
-    return "1" if re.search(r"색인|찾아보기|인명색인|사항색인|index", text, re.I) else "0"
+    return "1" if _RE_INDEX.search(text) else "0"
 
 def detect_lit_form(title: str, category: str, extra_text: str = "") -> str:
     blob = f"{title} {category} {extra_text}"
-    if re.search(r"서간집|편지|서간문|letters?", blob, re.I): return "i"    # 서간문학
-    if re.search(r"기행|여행기|여행 에세이|일기|수기|diary|travel", blob, re.I): return "m"  # 기행/일기/수기
-    if re.search(r"시집|산문시|poem|poetry", blob, re.I): return "p"        # 시
-    if re.search(r"소설|장편|중단편|novel|fiction", blob, re.I): return "f"  # 소설
-    if re.search(r"에세이|수필|essay", blob, re.I): return "e"               # 수필
-    return " "
+    return _lit_form_from(_scan_groups(_RE_LIT_FORM, blob))
 
 def detect_bio(text: str) -> str:
-    if re.search(r"자서전|회고록|autobiograph", text, re.I): return "a"
-    if re.search(r"전기|평전|인물 평전|biograph", text, re.I): return "b"
-    if re.search(r"전기적|자전적|회고|회상", text): return "d"
-    return " "
+    return _bio_from(_scan_groups(_RE_BIO, text))
 
 # 메인: ISBN 하나로 008 생성 (toc/300/041 연동 가능)
 
@@ -3072,7 +3326,7 @@ def build_008_from_isbn(
     override_lang3: str = None,      # 외부 모듈이 주면 최우선(041)
     cataloging_src: str = "a",       # 32 목록 전거(기본 'a')
 ):
-    today  = datetime.datetime.now().strftime("%y%m%d")  # YYMMDD
+    today  = _today_yymmdd()  # YYMMDD
     date1  = extract_year_from_aladin_pubdate(aladin_pubdate)
 
     # country 우선순위: override > 300발행지 매핑 > 기본값 -- 발행지미상인 경우
@@ -3098,12 +3352,13 @@ def build_008_from_isbn(
     # lang 우선순위: override(041) > 기본값
     lang3 = override_lang3 or LANG_FIXED
 
-    # 단어 감지용 텍스트: 제목 + 소개 + 목차
-    bigtext = " ".join([aladin_title or "", aladin_desc or "", aladin_toc or ""])
-    illus4    = detect_illus4(bigtext)
-    has_index = detect_index(bigtext)
-    lit_form  = detect_lit_form(aladin_title or "", aladin_category or "", bigtext)
-    bio       = detect_bio(bigtext)
+    # 단어 감지: 제목 + 소개 + 목차를 이어붙이지 않고 통합 정규식으로 한 번씩만 훑음
+    found = _scan_groups(_RE_DETECT_008, aladin_title, aladin_desc, aladin_toc)
+    illus4    = _illus4_from(found)
+    has_index = _index_from(found)
+    # 문학형식은 카테고리도 단서로 사용
+    lit_form  = _lit_form_from(found | _scan_groups(_RE_LIT_FORM, aladin_category))
+    bio       = _bio_from(found)
 
     return build_008_kormarc_bk(
         date_entered=today,
@@ -3119,10 +3374,11 @@ def build_008_from_isbn(
 # ========= 008 생성 블록 v3 끝 =========
 
 # 🔍 키워드 추출 (konlpy 없이)
+_RE_WORDS = re.compile(r'\b[\w가-힣]{2,}\b')
+
 def extract_keywords_from_text(text, top_n=7):
-    words = re.findall(r'\b[\w가-힣]{2,}\b', text)
-    filtered = [w for w in words if len(w) > 1]
-    freq = Counter(filtered)
+    # 단어 리스트를 만들지 않고 매치 스트림을 바로 집계 ({2,} 이라 길이 필터는 불필요)
+    freq = Counter(m.group(0) for m in _RE_WORDS.finditer(text))
     return [kw for kw, _ in freq.most_common(top_n)]
 
 def clean_keywords(words):
@@ -3132,6 +3388,18 @@ def clean_keywords(words):
 
 
 # 📡 부가기호, SET ISBN 추출 (국립중앙도서관)
+def _nlk_seoji_first_doc(base: str, params: dict) -> dict | None:
+    """서지API 한 엔드포인트 호출 → 첫 번째 doc(dict) 또는 None"""
+    r = SESSION.get(base, params=params, timeout=(5, 10))
+    r.raise_for_status()
+    j = _json_loads(r.content)
+    if isinstance(j, dict):
+        if "docs" in j and isinstance(j["docs"], list) and j["docs"]:
+            return j["docs"][0]
+        if "doc" in j and isinstance(j["doc"], list) and j["doc"]:
+            return j["doc"][0]
+    return None
+
 @st.cache_data(ttl=24*3600)
 
 def fetch_additional_code_from_nlk(isbn: str) -> dict:
@@ -3153,18 +3421,15 @@ def fetch_additional_code_from_nlk(isbn: str) -> dict:
         "isbn": isbn.strip().replace("-", ""),
     }
 
-    for base in attempts:
-        try:
-            r = SESSION.get(base, params=params, timeout=(5, 10))
-            r.raise_for_status()
-
-            j = r.json()
-            doc = None
-            if isinstance(j, dict):
-                if "docs" in j and isinstance(j["docs"], list) and j["docs"]:
-                    doc = j["docs"][0]
-                elif "doc" in j and isinstance(j["doc"], list) and j["doc"]:
-                    doc = j["doc"][0]
+    # 4개 엔드포인트 동시 요청 → 가장 먼저 성공한 응답 사용 (나머지는 취소)
+    ex = ThreadPoolExecutor(max_workers=len(attempts))
+    try:
+        futures = [ex.submit(_nlk_seoji_first_doc, base, params) for base in attempts]
+        for fut in as_completed(futures):
+            try:
+                doc = fut.result()
+            except Exception:
+                continue
             if not doc:
                 continue
 
@@ -3177,9 +3442,8 @@ def fetch_additional_code_from_nlk(isbn: str) -> dict:
                 "set_isbn": set_isbn,
                 "price": price,
             }
-
-        except Exception:
-            continue
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
 
     # 전부 실패하면 빈 값으로 반환
     return {
@@ -3198,40 +3462,52 @@ ISDS_LANGUAGE_CODES = {
     'und': '알 수 없음'
 }
 
-def detect_language(text):
-    text = re.sub(r'[\s\W_]+', '', text)
-    if not text:
-        return 'und'
-    first_char = text[0]
-    if '\uac00' <= first_char <= '\ud7a3':
-        return 'kor'
-    elif '\u3040' <= first_char <= '\u30ff':
-        return 'jpn'
-    elif '\u4e00' <= first_char <= '\u9fff':
-        return 'chi'
-    elif '\u0400' <= first_char <= '\u04FF':
-        return 'rus'
-    elif 'a' <= first_char.lower() <= 'z':
-        return 'eng'
-    else:
+_FIRST_CHAR_LANG_RANGES = _lang_range_table([
+    (0xAC00, 0xD7A3, 'kor'),
+    (0x3040, 0x30FF, 'jpn'),
+    (0x4E00, 0x9FFF, 'chi'),
+    (0x0400, 0x04FF, 'rus'),
+    (0x0041, 0x005A, 'eng'),
+    (0x0061, 0x007A, 'eng'),
+])
+
+@lru_cache(maxsize=4096)
+def detect_language(*chunks):
+    """
+    첫 번째 글자(문자/숫자)의 문자권으로 언어 추정.
+    여러 텍스트(예: 제목, 원제)를 넘기면 이어 붙이지 않고 순서대로 스캔.
+    """
+    # 전체 문자열 정규식 치환 없이 앞에서부터 스캔
+    chars = itertools.chain.from_iterable(c for c in chunks if c)
+    first_char = next((ch for ch in chars if ch.isalnum()), "")
+    if not first_char:
         return 'und'
+    lang = _lang_by_range(ord(first_char), _FIRST_CHAR_LANG_RANGES)
+    if lang:
+        return lang
+    # 비ASCII 중 소문자화하면 a-z가 되는 문자(예: 켈빈 기호 K) 호환
+    return 'eng' if 'a' <= first_char.lower() <= 'z' else 'und'
+
+_RE_041_SUBS = re.compile(r"\$([ah])([a-z]{3})")  # $a/$h 언어코드를 한 번의 스캔으로
 
+@lru_cache(maxsize=256)  # 041 조합은 몇 가지뿐 → 같은 041이면 546 문장 재사용
 def generate_546_from_041_kormarc(marc_041: str) -> str:
+    lang_of = ISDS_LANGUAGE_CODES.get  # 전역 조회/속성 조회를 한 번만
     a_codes, h_code = [], None
-    for part in marc_041.split():
-        if part.startswith("$a"):
-            a_codes.append(part[2:])
-        elif part.startswith("$h"):
-            h_code = part[2:]
+    for sub, code in _RE_041_SUBS.findall(marc_041):
+        if sub == "a":
+            a_codes.append(code)
+        else:
+            h_code = code
     if len(a_codes) == 1:
-        a_lang = ISDS_LANGUAGE_CODES.get(a_codes[0], "알 수 없음")
+        a_lang = lang_of(a_codes[0], "알 수 없음")
         if h_code:
-            h_lang = ISDS_LANGUAGE_CODES.get(h_code, "알 수 없음")
+            h_lang = lang_of(h_code, "알 수 없음")
             return f"{h_lang} 원작을 {a_lang}로 번역"
         else:
             return f"{a_lang}로 씀"
     elif len(a_codes) > 1:
-        langs = [ISDS_LANGUAGE_CODES.get(code, "알 수 없음") for code in a_codes]
+        langs = [lang_of(code, "알 수 없음") for code in a_codes]
         return f"{'、'.join(langs)} 병기"
     return "언어 정보 없음"
 
@@ -3239,12 +3515,13 @@ def generate_546_from_041_kormarc(marc_041: str) -> str:
     if not has_h:
         return ""
 
+# 상품 페이지 전체 트리 대신 원제/정가 노드만 파싱
+_ALADIN_ORIG_PRICE_ONLY = SoupStrainer(["div", "span"], class_=["info_original", "price2"])
+
 def crawl_aladin_original_and_price(isbn13):
     url = f"https://www.aladin.co.kr/shop/wproduct.aspx?ISBN={isbn13}"
-    headers = {"User-Agent": "Mozilla/5.0"}
     try:
-        res = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(res.text, "html.parser")
+        soup = BeautifulSoup(_fetch_aladin_html(url, 10), _BS_PARSER, parse_only=_ALADIN_ORIG_PRICE_ONLY)
         original = soup.select_one("div.info_original")
         price = soup.select_one("span.price2")
         return {
@@ -3255,23 +3532,38 @@ def crawl_aladin_original_and_price(isbn13):
         return {}
 
 # ---- 653 전처리 유틸 ----
+class _PunctToSpace(dict):
+    """str.translate용 테이블: 한/영/숫자/밑줄/공백 외 문자 → 공백 (처음 본 코드포인트만 계산해 채움)"""
+    def __missing__(self, cp):
+        ch = chr(cp)
+        v = cp if (ch.isalnum() or ch == "_" or ch.isspace()) else " "
+        self[cp] = v
+        return v
+
+_PUNCT_TABLE = _PunctToSpace()  # 기존 [^\w\s\uac00-\ud7a3] 치환과 동일
+_RE_WS = re.compile(r"\s+")
+
+@lru_cache(maxsize=4096)
 def _norm(text: str) -> str:
-    import re, unicodedata
     if not text:
         return ""
     text = unicodedata.normalize("NFKC", text).lower()
-    text = re.sub(r"[^\w\s\uac00-\ud7a3]", " ", text)  # 한/영/숫자/공백만
-    return re.sub(r"\s+", " ", text).strip()
+    text = text.translate(_PUNCT_TABLE)
+    return _RE_WS.sub(" ", text).strip()
+
+_RE_PAREN = re.compile(r"\(.*?\)")
+_RE_AUTHOR_SEP = re.compile(r"[/;·,]")
 
 def _clean_author_str(s: str) -> str:
-    import re
     if not s:
         return ""
-    s = re.sub(r"\(.*?\)", " ", s)      # (지은이), (옮긴이) 등 제거
-    s = re.sub(r"[/;·,]", " ", s)       # 구분자 공백화
-    return re.sub(r"\s+", " ", s).strip()
+    s = _RE_PAREN.sub(" ", s)        # (지은이), (옮긴이) 등 제거
+    s = _RE_AUTHOR_SEP.sub(" ", s)   # 구분자 공백화
+    return _RE_WS.sub(" ", s).strip()
 
-def _build_forbidden_set(title: str, authors: str) -> set:
+@lru_cache(maxsize=2048)
+def _build_forbidden_set(title: str, authors: str) -> frozenset:
+    """제목/저자 → 653 금칙어 집합 (도서별로 고정이라 (title, authors) 기준 캐시)"""
     t_norm = _norm(title)
     a_norm = _norm(authors)
     forb = set()
@@ -3281,16 +3573,25 @@ def _build_forbidden_set(title: str, authors: str) -> set:
     if a_norm:
         forb.update(a_norm.split())
         forb.add(a_norm.replace(" ", ""))
-    return {f for f in forb if f and len(f) >= 2}  # 1글자 제거
+    return frozenset(f for f in forb if f and len(f) >= 2)  # 1글자 제거
+
+@lru_cache(maxsize=2048)
+def _forbidden_matcher(forbidden: frozenset):
+    """금칙어 집합 → (금칙어 포함 여부를 한 번에 보는 정규식, 역방향 검사용 결합 문자열)"""
+    toks = sorted(forbidden, key=len, reverse=True)
+    pat = re.compile("|".join(map(re.escape, toks))) if toks else None
+    return pat, "\x01".join(toks)   # _norm 결과에는 \x01이 없으므로 토큰 경계를 넘지 않음
 
 def _should_keep_keyword(kw: str, forbidden: set) -> bool:
     n = _norm(kw)
     if not n or len(n.replace(" ", "")) < 2:
         return False
-    for tok in forbidden:
-        if tok in n or n in tok:
-            return False
-    return True
+    if not isinstance(forbidden, frozenset):
+        forbidden = frozenset(forbidden)
+    pat, joined = _forbidden_matcher(forbidden)
+    if pat is not None and pat.search(n):   # 금칙어 ⊂ 키워드
+        return False
+    return n not in joined                  # 키워드 ⊂ 금칙어
 # -------------------------
 
 # 📄 653 필드 키워드 생성
@@ -3305,7 +3606,7 @@ def fetch_aladin_metadata(isbn):
         "&Version=20131101"
         "&OptResult=Toc"
     )
-    data = requests.get(url).json()
+    data = _json_loads(SESSION.get(url, timeout=(5, 15)).content)
     item = (data.get("item") or [{}])[0]
 
     # 저자 필드 다양한 키 대응
@@ -3323,43 +3624,70 @@ def fetch_aladin_metadata(isbn):
 
 
 # ③ GPT-4 기반 653 생성 함수
-def generate_653_with_gpt(category, title, authors, description, toc, max_keywords=7):
-    import re
+def _gpt653_cache_key(category, title, authors, description, toc, max_keywords) -> str:
+    """653 GPT 응답 캐시 키: 입력을 정규화한 뒤 SHA-256 해시"""
+    src = "|".join([
+        (category or "").strip(),
+        (title or "").strip(),
+        (authors or "").strip(),
+        (description or "").strip()[:2000],
+        (toc or "").strip()[:2000],
+        str(max_keywords),
+    ])
+    return "gpt653|" + hashlib.sha256(src.encode("utf-8")).hexdigest()
+
+# 653 GPT 프롬프트 공통 규칙 (건별/일괄 프롬프트가 함께 사용)
+_GPT653_RULES = (
+    "당신은 KORMARC 작성 경험이 풍부한 도서관 메타데이터 전문가입니다. "
+    "주어진 분류 정보, 설명, 목차를 바탕으로 'MARC 653 자유주제어'를 도출합니다.\n\n"
+    "원칙\n"
+    "- 653은 '검색·발견' 효용을 높이는 명사 중심 주제어로 구성하되, "
+    "**모든 주제어는 붙여쓰기 형태(공백 없음)**로 작성합니다. 예: '아동문학', '정서조절', '시간관리', '인지과학'\n"
+    "- 서명(245)·저자(100/700)에서 나온 단어/표현(활용형 포함)과 시리즈명, 출판사명, 판·쇄, 연도, 페이지수, 가격, 수상, 홍보문구를 제외합니다.\n"
+    "- 너무 일반적이거나 기능이 약한 표현은 제외합니다. "
+    "예: 연구, 개론, 방법, 사례, 고찰, 문제, 개정판, 서문, 목차, 참고문헌, 저자, 번역, 추천사, 베스트셀러, 안내, 소개, 이론\n"
+    "- **추상·평가·메타 표현은 절대 사용하지 마세요.** "
+    "예: 사회적의의, 의의, 시사점, 의의와한계, 배경, 개관, 개요, 현황, 동향, 의미, 정리, 결론, 서사분석(일반), 비평(일반)\n"
+    "- 위와 같은 표현이 떠오르면 반드시 책의 실제 주제를 드러내는 **구체 하위개념**으로 치환합니다. "
+    "예: '사회적의의' → (금지) / '식민경험', '이민정체성', '도시화서사', '광둥어문학', '홍콩근현대사' 등\n"
+    "- 상·하위 분류가 주어지면, 주제의 '구체성'을 반영합니다(가능하면 2~6글자 복합명사 위주).\n\n"
+    "선정 기준(출력하지 마세요)\n"
+    "- 관련성: 책의 핵심 주제를 직접 설명하는가?\n"
+    "- 구체성: 포괄어(심리학, 철학)보다 하위 개념(정서조절, 실존주의)을 선호.\n"
+    "- 비중복성: 의미가 겹치거나 형태만 다른 후보는 하나로 대표.\n"
+    "- 균형: 분류·설명·목차의 균형을 추구.\n\n"
+)
+_GPT653_FALLBACK_RULES = (
+    "충분 정보가 없을 때\n"
+    "- 분류의 마지막 1~2개 요소를 반영하고, 설명·목차에서 핵심 개념을 보수적으로 선별하세요.\n"
+    "- 생각 과정은 출력하지 말고, 최종 결과만 형식대로 제공합니다."
+)
+
+# GPT 응답 파싱: '$a키워드' 반복 / 형식을 어긴 경우 구분자 분리
+_RE_653_RAW_A = re.compile(r"\$a(.*?)(?=(?:\$a|$))", re.DOTALL)
+_RE_653_RAW_SPLIT = re.compile(r"[,\n;|/·]")
 
+def generate_653_with_gpt(category, title, authors, description, toc, max_keywords=7,
+                          forbidden: frozenset | None = None):
+    """forbidden: 호출 측에서 미리 만든 금칙어 집합(없으면 title/authors로 생성)"""
     parts = [p.strip() for p in (category or "").split(">") if p.strip()]
     cat_tail = " ".join(parts[-2:]) if len(parts) >= 2 else (parts[-1] if parts else "")
 
-    forbidden = _build_forbidden_set(title, authors)
+    if forbidden is None:
+        forbidden = _build_forbidden_set(title or "", authors or "")
+    elif not isinstance(forbidden, frozenset):
+        forbidden = frozenset(forbidden)
     forbidden_list = ", ".join(sorted(forbidden)) or "(없음)"
 
     # ===== 프롬프트(추상·메타 표현 금지 강화) =====
     system_msg = {
         "role": "system",
         "content": (
-            "당신은 KORMARC 작성 경험이 풍부한 도서관 메타데이터 전문가입니다. "
-            "주어진 분류 정보, 설명, 목차를 바탕으로 'MARC 653 자유주제어'를 도출합니다.\n\n"
-            "원칙\n"
-            "- 653은 '검색·발견' 효용을 높이는 명사 중심 주제어로 구성하되, "
-            "**모든 주제어는 붙여쓰기 형태(공백 없음)**로 작성합니다. 예: '아동문학', '정서조절', '시간관리', '인지과학'\n"
-            "- 서명(245)·저자(100/700)에서 나온 단어/표현(활용형 포함)과 시리즈명, 출판사명, 판·쇄, 연도, 페이지수, 가격, 수상, 홍보문구를 제외합니다.\n"
-            "- 너무 일반적이거나 기능이 약한 표현은 제외합니다. "
-            "예: 연구, 개론, 방법, 사례, 고찰, 문제, 개정판, 서문, 목차, 참고문헌, 저자, 번역, 추천사, 베스트셀러, 안내, 소개, 이론\n"
-            "- **추상·평가·메타 표현은 절대 사용하지 마세요.** "
-            "예: 사회적의의, 의의, 시사점, 의의와한계, 배경, 개관, 개요, 현황, 동향, 의미, 정리, 결론, 서사분석(일반), 비평(일반)\n"
-            "- 위와 같은 표현이 떠오르면 반드시 책의 실제 주제를 드러내는 **구체 하위개념**으로 치환합니다. "
-            "예: '사회적의의' → (금지) / '식민경험', '이민정체성', '도시화서사', '광둥어문학', '홍콩근현대사' 등\n"
-            "- 상·하위 분류가 주어지면, 주제의 '구체성'을 반영합니다(가능하면 2~6글자 복합명사 위주).\n\n"
-            "선정 기준(출력하지 마세요)\n"
-            "- 관련성: 책의 핵심 주제를 직접 설명하는가?\n"
-            "- 구체성: 포괄어(심리학, 철학)보다 하위 개념(정서조절, 실존주의)을 선호.\n"
-            "- 비중복성: 의미가 겹치거나 형태만 다른 후보는 하나로 대표.\n"
-            "- 균형: 분류·설명·목차의 균형을 추구.\n\n"
-            "출력 형식\n"
+            _GPT653_RULES
+            + "출력 형식\n"
             f"- 한 줄, 다음과 같이 출력: `$a키워드1 $a키워드2 $a키워드3 ...` (최대 {max_keywords}개 이내)\n"
             "- 띄어쓰기 없이 한글 명사로만 구성하며, 쉼표/번호/괄호/줄바꿈/불필요한 문장 금지.\n\n"
-            "충분 정보가 없을 때\n"
-            "- 분류의 마지막 1~2개 요소를 반영하고, 설명·목차에서 핵심 개념을 보수적으로 선별하세요.\n"
-            "- 생각 과정은 출력하지 말고, 최종 결과만 형식대로 제공합니다."
+            + _GPT653_FALLBACK_RULES
         )
     }
 
@@ -3387,56 +3715,62 @@ def generate_653_with_gpt(category, title, authors, description, toc, max_keywor
     }
     # ================================================
 
+    # 같은 입력이면 GPT 재호출 없이 디스크 캐시(SQLite) 응답 사용
+    cache_key = _gpt653_cache_key(category, title, authors, description, toc, max_keywords)
+
     try:
-        resp = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[system_msg, user_msg],
-            temperature=0.2,
-            max_tokens=180,
-        )
-        raw = (resp.choices[0].message.content or "").strip()
+        raw = cache_get(cache_key)
+        fresh = not isinstance(raw, str) or not raw
+        if fresh:
+            resp = _get_lang_client().chat.completions.create(
+                model="gpt-4o",
+                messages=[system_msg, user_msg],
+                temperature=0.2,
+                max_tokens=180,
+            )
+            raw = (resp.choices[0].message.content or "").strip()
 
-        pattern = re.compile(r"\$a(.*?)(?=(?:\$a|$))", re.DOTALL)
-        kws = [m.group(1).strip() for m in pattern.finditer(raw)]
+        kws = [m.group(1).strip() for m in _RE_653_RAW_A.finditer(raw)]
         if not kws:
-            tmp = re.split(r"[,\n;|/·]", raw)
-            kws = [t.strip().lstrip("$a") for t in tmp if t.strip()]
-
-        # 붙여쓰기
-        kws = [kw.replace(" ", "") for kw in kws if kw]
+            kws = [t.strip().lstrip("$a") for t in _RE_653_RAW_SPLIT.split(raw) if t.strip()]
 
-        # 금칙어 필터
-        kws = [kw for kw in kws if _should_keep_keyword(kw, forbidden)]
-
-        # 정규화 중복 제거
-        seen = set(); uniq = []
+        # 붙여쓰기 → 금칙어 필터 → 정규화 기준 중복 제거(첫 표기 유지)를 한 번에, max_keywords개 모이면 중단
+        uniq: dict[str, str] = {}
         for kw in kws:
-            n = _norm(kw)
-            if n not in seen:
-                seen.add(n); uniq.append(kw)
-
-        uniq = uniq[:max_keywords]
-        return "".join(f"$a{kw}" for kw in uniq)
+            kw = kw.replace(" ", "")
+            if kw and _should_keep_keyword(kw, forbidden):
+                uniq.setdefault(_norm(kw), kw)
+                if len(uniq) >= max_keywords:
+                    break
+        # 키워드가 하나라도 남은 응답만 캐시 (빈/불량 응답은 다음 실행에서 다시 생성)
+        if fresh and uniq:
+            cache_set(cache_key, raw)
+        return "".join(f"$a{kw}" for kw in list(uniq.values())[:max_keywords])
 
     except Exception as e:
-        st.warning(f"⚠️ 653 주제어 생성 실패: {e}")
+        ui.warning(f"⚠️ 653 주제어 생성 실패: {e}")
         return None
  
 
+_RE_041_A_LANG = re.compile(r"\$a([a-z]{3})", re.I)
+
 def _lang3_from_tag041(tag_041: str | None) -> str | None:
     """'041 $akor$hrus'에서 첫 $a만 뽑아 008 lang3 override에 사용."""
     if not tag_041: return None
-    m = re.search(r"\$a([a-z]{3})", tag_041, flags=re.I)
+    m = _RE_041_A_LANG.search(tag_041)
     return m.group(1).lower() if m else None
 
-def _build_020_from_item_and_nlk(isbn: str, item: dict) -> str:
-    """020 $a$g(:$c) — NLK 부가기호를 $c(가격)보다 앞에 배치"""
+def _build_020_from_item_and_nlk(isbn: str, item: dict, nlk_extra: dict | None = None) -> str:
+    """020 $a$g(:$c) — NLK 부가기호를 $c(가격)보다 앞에 배치
+    nlk_extra: 이미 조회한 fetch_additional_code_from_nlk() 결과 (없으면 여기서 조회)"""
     # 1) 알라딘 가격
     price = str((item or {}).get("priceStandard", "") or "").strip()
 
     # 2) NLK에서 부가기호 + 가격 가져오기
     try:
-        nlk_extra = fetch_additional_code_from_nlk(isbn) or {}
+        if nlk_extra is None:
+            nlk_extra = fetch_additional_code_from_nlk(isbn)
+        nlk_extra = nlk_extra or {}
         add_code = nlk_extra.get("add_code", "")
         price_from_nlk = nlk_extra.get("price", "")
     except Exception:
@@ -3457,25 +3791,144 @@ def _build_020_from_item_and_nlk(isbn: str, item: dict) -> str:
 
 
 
+def _653_inputs(item: dict) -> tuple[str, str, str, str, str]:
+    """알라딘 item → 653 GPT 입력 (category, title, authors, description, toc)"""
+    item = item or {}
+    title = item.get("title","") or ""
+    category = item.get("categoryName","") or ""
+    raw_author = item.get("author","") or ""
+    desc = item.get("description","") or ""
+    toc  = (item.get("subInfo",{}) or {}).get("toc","") or ""
+    return category, title, _clean_author_str(raw_author), desc, toc
+
 def _build_653_via_gpt(item: dict) -> str | None:
     """네가 올린 generate_653_with_gpt() 그대로 활용해서 653 한 줄 반환."""
-    title = (item or {}).get("title","") or ""
-    category = (item or {}).get("categoryName","") or ""
-    raw_author = (item or {}).get("author","") or ""
-    desc = (item or {}).get("description","") or ""
-    toc  = ((item or {}).get("subInfo",{}) or {}).get("toc","") or ""
+    category, title, authors, desc, toc = _653_inputs(item)
 
     kwline = generate_653_with_gpt(
         category=category,
         title=title,
-        authors=_clean_author_str(raw_author),
+        authors=authors,
         description=desc,
         toc=toc,
-        max_keywords=7
+        max_keywords=7,
+        forbidden=_build_forbidden_set(title, authors),
     )
     # kwline이 "$a키워드$a..." 형태라고 가정
     return f"=653  \\\\{kwline.replace(' ', '')}" if kwline else None
 
+_RE_653_A = re.compile(r"\$a([^$]+)")
+
+def generate_653_batch(items: list[dict], max_workers: int = 8) -> list[str | None]:
+    """여러 도서의 653 GPT 호출을 동시에 수행 (결과 순서 = items 순서, 응답은 디스크 캐시에 저장됨)"""
+    if not items:
+        return []
+    with _st_thread_pool(min(max_workers, len(items))) as ex:
+        return list(ex.map(_build_653_via_gpt, items))
+
+_GPT653_BATCH_SIZE = 10  # 한 번의 GPT 호출에 묶는 도서 수 (프롬프트 길이 제한)
+
+def _prefetch_653_gpt_batched(items: list[dict], batch_size: int = _GPT653_BATCH_SIZE,
+                              max_keywords: int = 7) -> None:
+    """
+    캐시에 없는 도서들을 batch_size권씩 묶어 GPT 한 번(JSON 응답)으로 653 응답을 받고,
+    건별 호출과 같은 캐시 키/형식('$a키워드 $a키워드')으로 저장.
+    응답에서 빠진 도서는 이후 건별 호출(generate_653_with_gpt)이 그대로 처리.
+    """
+    pending, seen = [], set()
+    for item in items:
+        category, title, authors, desc, toc = _653_inputs(item)
+        key = _gpt653_cache_key(category, title, authors, desc, toc, max_keywords)
+        if key in seen:
+            continue
+        seen.add(key)
+        cached = cache_get(key)
+        if isinstance(cached, str) and cached:
+            continue
+        parts = [p.strip() for p in category.split(">") if p.strip()]
+        pending.append((key, {
+            "category": category,
+            "cat_tail": " ".join(parts[-2:]),
+            "title": title,
+            "authors": authors,
+            "description": desc[:1500],
+            "toc": toc[:1500],
+            "forbidden": sorted(_build_forbidden_set(title, authors)),
+        }))
+    if not pending:
+        return
+
+    system_content = (
+        _GPT653_RULES
+        + "출력 형식\n"
+        "- JSON 객체 하나만 출력: {\"results\": [{\"id\": 도서번호, \"keywords\": [\"키워드1\", \"키워드2\"]}]}\n"
+        f"- 도서마다 keywords는 최대 {max_keywords}개, 띄어쓰기 없는 한글 명사만.\n\n"
+        + _GPT653_FALLBACK_RULES
+    )
+
+    def _one_batch(chunk):
+        books = [{"id": i, **payload} for i, (_, payload) in enumerate(chunk)]
+        user_content = (
+            "아래 JSON 배열의 도서마다 MARC 653 주제어를 도출해 주세요.\n"
+            "각 도서의 forbidden(서명/저자 유래 제외어)과 그 활용형은 해당 도서의 주제어에 넣지 마세요.\n\n"
+            + _json_dumps_compact(books)
+        )
+        try:
+            resp = _get_lang_client().chat.completions.create(
+                model="gpt-4o",
+                messages=[{"role": "system", "content": system_content},
+                          {"role": "user", "content": user_content}],
+                temperature=0.2,
+                max_tokens=100 * len(chunk) + 50,
+                response_format={"type": "json_object"},
+            )
+            data = _json_loads(resp.choices[0].message.content or "{}")
+        except Exception:
+            return []
+        out = []
+        for r in (data.get("results") or []) if isinstance(data, dict) else []:
+            try:
+                idx = int(r.get("id"))
+            except (AttributeError, TypeError, ValueError):
+                continue
+            if not 0 <= idx < len(chunk):
+                continue
+            # 건별 호출과 같은 필터(붙여쓰기 → 금칙어 → 정규화 중복 제거)를 먼저 적용해
+            # 살아남은 키워드가 있는 도서만 캐시 (없으면 건별 호출로 다시 물어봄)
+            key, payload = chunk[idx]
+            forbidden = frozenset(payload["forbidden"])
+            uniq: dict[str, str] = {}
+            for k in (r.get("keywords") or []):
+                kw = str(k).strip().replace(" ", "")
+                if kw and _should_keep_keyword(kw, forbidden):
+                    uniq.setdefault(_norm(kw), kw)
+                    if len(uniq) >= max_keywords:
+                        break
+            if uniq:
+                out.append((key, " ".join(f"$a{kw}" for kw in uniq.values())))
+        return out
+
+    chunks = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    with _st_thread_pool(min(4, len(chunks))) as ex:
+        entries = [e for res in ex.map(_one_batch, chunks) for e in res]
+    cache_set_many(entries)
+
+def prewarm_653_cache(isbns: list[str], max_workers: int = 8) -> None:
+    """일괄 처리 전에 알라딘 item 조회 + 653 GPT 응답을 미리 병렬로 받아 캐시를 채움."""
+    uniq = list(dict.fromkeys(i for i in isbns if i))
+    if not uniq:
+        return
+    def _safe_item(isbn):
+        try:
+            return fetch_aladin_item(isbn)
+        except Exception:
+            return None
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(uniq))) as ex:
+        items = [it for it in ex.map(_safe_item, uniq) if it]
+    # 묶음 호출로 대부분 채우고, 빠진 도서만 건별 호출 (캐시 적중분은 즉시 반환)
+    _prefetch_653_gpt_batched(items)
+    generate_653_batch(items, max_workers=max_workers)
+
 def _parse_653_keywords(tag_653: str | None) -> list[str]:
     """
     '=653  \\$a아동문학$a정서조절$a시간관리' → ['아동문학','정서조절','시간관리']
@@ -3485,12 +3938,15 @@ def _parse_653_keywords(tag_653: str | None) -> list[str]:
         return []
     s = tag_653.strip()
 
-    # 접두부 정리
-    s = re.sub(r"^=653\s+\\\\", "", s)
+    # 접두부 정리: '=653  \\' (정규식 대신 문자열 슬라이싱)
+    if s.startswith("=653"):
+        rest = s[4:].lstrip()
+        if len(rest) < len(s) - 4 and rest.startswith("\\\\"):
+            s = rest[2:]
 
     # $a 서브필드 추출
     kws = []
-    for m in re.finditer(r"\$a([^$]+)", s):
+    for m in _RE_653_A.finditer(s):
         w = (m.group(1) or "").strip()
         if w:
             kws.append(w)
@@ -3518,8 +3974,7 @@ def _extract_price_kr(item: dict, isbn: str) -> str:
         except Exception:
             raw = ""
     # 3) 숫자만 남기기
-    import re
-    digits = re.sub(r"[^\d]", "", raw)
+    digits = "".join(filter(str.isdecimal, raw))  # [^\d] 치환과 동일 (유니코드 Nd)
     return digits  # "15000" 같은 형태
 
 # --- 950 빌더 ---
@@ -3532,33 +3987,67 @@ def build_950_from_item_and_price(item: dict, isbn: str) -> str:
 # =========================
 # --- 구글시트 로드 & 캐시 관리 ---
 # =========================
-@st.cache_data(ttl=3600)
-def load_publisher_db():
+@st.cache_resource(show_spinner=False)
+def _get_gspread_client():
+    """서비스 계정 인증 + gspread 클라이언트는 프로세스당 한 번만 생성"""
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
     creds = ServiceAccountCredentials.from_json_keyfile_dict(st.secrets["gspread"], 
                                                             ["https://spreadsheets.google.com/feeds",
                                                              "https://www.googleapis.com/auth/drive"])
-    client = gspread.authorize(creds)
-    sh = client.open("출판사 DB")
-    
-    # KPIPA_PUB_REG: 번호, 출판사명, 주소, 전화번호 → 출판사명, 주소만 사용
-    pub_rows = sh.worksheet("발행처명–주소 연결표").get_all_values()[1:]
-    pub_rows_filtered = [row[1:3] for row in pub_rows]  # 출판사명, 주소
-    publisher_data = pd.DataFrame(pub_rows_filtered, columns=["출판사명", "주소"])
-    
-    # 008: 발행국 발행국 부호 → 첫 2열만
-    region_rows = sh.worksheet("발행국명–발행국부호 연결표").get_all_values()[1:]
-    region_rows_filtered = [row[:2] for row in region_rows]
-    region_data = pd.DataFrame(region_rows_filtered, columns=["발행국", "발행국 부호"])
-    
-    # IM_* 시트: 출판사/임프린트 하나의 칼럼
-    imprint_frames = []
-    for ws in sh.worksheets():
-        if ws.title.startswith("발행처-임프린트 연결표"):
-            data = ws.get_all_values()[1:]
-            imprint_frames.extend([row[0] for row in data if row])
-    imprint_data = pd.DataFrame(imprint_frames, columns=["임프린트"])
-    
-    return publisher_data, region_data, imprint_data
+    return gspread.authorize(creds)
+
+@st.cache_resource(show_spinner=False)
+def _get_publisher_db_sheet():
+    """'출판사 DB' 스프레드시트 핸들 (open()의 Drive 검색 + 메타데이터 조회는 프로세스당 한 번)"""
+    return _get_gspread_client().open("출판사 DB")
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_publisher_db():
+    """
+    출판사 DB 시트 → (pub_index, region_index, imprint_index)
+    - 시트 제목만 조회 1회 + values_batch_get 1회로 필요한 범위만 가져옴 (DataFrame 미생성)
+    """
+    sh = _get_publisher_db_sheet()
+
+    # worksheets()는 시트별 전체 속성을 받아오므로 제목 필드만 요청
+    meta = sh.fetch_sheet_metadata(params={"fields": "sheets.properties.title"})
+    titles = [ws["properties"]["title"] for ws in meta.get("sheets", [])]
+    imprint_titles = [t for t in titles if t.startswith("발행처-임프린트 연결표")]
+    ranges = [
+        "'발행처명–주소 연결표'!B2:C",        # KPIPA_PUB_REG: 번호, 출판사명, 주소, 전화번호 → 출판사명, 주소만
+        "'발행국명–발행국부호 연결표'!A2:B",   # 008: 발행국, 발행국 부호
+    ] + [f"'{t}'!A2:A" for t in imprint_titles]  # IM_* 시트: 출판사/임프린트 하나의 칼럼
+    value_ranges = sh.values_batch_get(ranges).get("valueRanges", [])
+    values = [vr.get("values", []) for vr in value_ranges] + [[]] * (len(ranges) - len(value_ranges))
+
+    # 정규화 출판사명 → 주소 인덱스 (검색 때마다 전체 재정규화 방지, 첫 행 우선)
+    pub_index: dict[str, str] = {}
+    for row in values[0]:
+        name = row[0] if row else ""
+        addr = row[1] if len(row) > 1 else ""
+        pub_index.setdefault(normalize_publisher_name(name), addr)
+
+    # 정규화 지역명 → 발행국 부호 인덱스 (첫 행 우선)
+    region_index: dict[str, str] = {}
+    for row in values[1]:
+        region = row[0] if row else ""
+        code = row[1] if len(row) > 1 else ""
+        region_index.setdefault(normalize_region_for_code(region), code.strip() or "   ")
+
+    # 정규화 임프린트명 → 발행처명 인덱스 ('발행처 / 임프린트' 행만, 첫 행 우선)
+    imprint_index: dict[str, str] = {}
+    for rows in values[2:]:
+        for row in rows:
+            full_text = row[0] if row else ""
+            if "/" not in full_text:
+                continue
+            pub_part, imprint_part = [p.strip() for p in full_text.split("/", 1)]
+            if imprint_part:
+                imprint_index.setdefault(normalize_publisher_name(imprint_part), pub_part)
+
+    return pub_index, region_index, imprint_index
 
 # =========================
 # --- 알라딘 API ---
@@ -3569,9 +4058,9 @@ def search_aladin_by_isbn(isbn):
         url = "https://www.aladin.co.kr/ttb/api/ItemLookUp.aspx"
         params = {"ttbkey": ttbkey, "itemIdType": "ISBN", "ItemId": isbn, 
                   "output": "js", "Version": "20131101"}
-        res = requests.get(url, params=params, timeout=15)
+        res = SESSION.get(url, params=params, timeout=15)
         res.raise_for_status()
-        data = res.json()
+        data = _json_loads(res.content)
         if "item" not in data or not data["item"]:
             return None, f"도서 정보를 찾을 수 없습니다. [응답: {data}]"
         book = data["item"][0]
@@ -3590,24 +4079,41 @@ def search_aladin_by_isbn(isbn):
 # =========================
 # --- 정규화 함수 ---
 # =========================
+_RE_PUB_NORM = re.compile(r"\s|\(.*?\)|주식회사|㈜|도서출판|출판사")
+_RE_PUB_NORM_KPIPA = re.compile(r"\s|\(.*?\)|주식회사|㈜|도서출판|출판사|프레스")  # KPIPA 표기는 '프레스'까지 제거
+_RE_STAGE2 = re.compile(r"(주니어|JUNIOR|어린이|키즈|북스|아이세움|프레스)", re.IGNORECASE)
+_STAGE2_ENG_TO_KOR = {"springer": "스프링거", "cambridge": "케임브리지", "oxford": "옥스포드"}
+_RE_STAGE2_ENG = re.compile("|".join(map(re.escape, _STAGE2_ENG_TO_KOR)), re.IGNORECASE)
+_RE_BRACKET = re.compile(r"\((.*?)\)")
+_RE_ALIAS_SEP = re.compile(r"[,/]")
+
+@lru_cache(maxsize=8192)
 def normalize_publisher_name(name):
-    return re.sub(r"\s|\(.*?\)|주식회사|㈜|도서출판|출판사", "", name).lower()
+    name = name or ""
+    # 스크레이핑/시트 값의 전각 괄호·공백 등 호환 문자는 NFKC로 한 번 정리
+    # (DB 인덱스와 검색어가 모두 이 함수를 거치므로 키가 일관되게 맞춰짐)
+    if not name.isascii():
+        name = unicodedata.normalize("NFKC", name)
+    # 제거 대상이 하나도 없으면 sub 생략 (DB 컬럼 대부분이 이미 정규화된 형태)
+    if ("(" not in name and "㈜" not in name and "주식회사" not in name
+            and "출판사" not in name and "도서출판" not in name
+            and not any(map(str.isspace, name))):
+        return name.lower()
+    return _RE_PUB_NORM.sub("", name).lower()
 
 def normalize_stage2(name):
-    name = re.sub(r"(주니어|JUNIOR|어린이|키즈|북스|아이세움|프레스)", "", name, flags=re.IGNORECASE)
-    eng_to_kor = {"springer": "스프링거", "cambridge": "케임브리지", "oxford": "옥스포드"}
-    for eng, kor in eng_to_kor.items():
-        name = re.sub(eng, kor, name, flags=re.IGNORECASE)
+    name = _RE_STAGE2.sub("", name)
+    name = _RE_STAGE2_ENG.sub(lambda m: _STAGE2_ENG_TO_KOR[m.group(0).lower()], name)
     return name.strip().lower()
 
 def split_publisher_aliases(name):
     aliases = []
-    bracket_contents = re.findall(r"\((.*?)\)", name)
+    bracket_contents = _RE_BRACKET.findall(name)
     for content in bracket_contents:
-        parts = re.split(r"[,/]", content)
+        parts = _RE_ALIAS_SEP.split(content)
         parts = [p.strip() for p in parts if p.strip()]
         aliases.extend(parts)
-    name_no_brackets = re.sub(r"\(.*?\)", "", name).strip()
+    name_no_brackets = _RE_PAREN.sub("", name).strip()
     if "/" in name_no_brackets:
         parts = [p.strip() for p in name_no_brackets.split("/") if p.strip()]
         rep_name = parts[0]
@@ -3616,14 +4122,15 @@ def split_publisher_aliases(name):
         rep_name = name_no_brackets
     return rep_name, aliases
 
+# 광역시/특별시 이름: 주소에 하나라도 있으면 앞 두 글자 사용 (한 번의 search로 판정)
+_RE_MAJOR_CITY = re.compile("서울|인천|대전|광주|울산|대구|부산|세종")
+
 def normalize_publisher_location_for_display(location_name):
     if not location_name or location_name in ("출판지 미상", "예외 발생"):
         return location_name
     location_name = location_name.strip()
-    major_cities = ["서울", "인천", "대전", "광주", "울산", "대구", "부산", "세종"]
-    for city in major_cities:
-        if city in location_name:
-            return location_name[:2]
+    if _RE_MAJOR_CITY.search(location_name):
+        return location_name[:2]
     parts = location_name.split()
     loc = parts[1] if len(parts) > 1 else parts[0]
     if loc.endswith("시"):
@@ -3633,14 +4140,14 @@ def normalize_publisher_location_for_display(location_name):
 # =========================
 # --- KPIPA DB 검색 보조 함수 ---
 # =========================
-def search_publisher_location_with_alias(name, publisher_data):
+def search_publisher_location_with_alias(name, pub_index):
+    """pub_index: load_publisher_db()의 {정규화 출판사명: 주소}"""
     debug_msgs = []
     if not name:
         return "출판지 미상", ["❌ 검색 실패: 입력된 출판사명이 없음"]
     norm_name = normalize_publisher_name(name)
-    candidates = publisher_data[publisher_data["출판사명"].apply(lambda x: normalize_publisher_name(x)) == norm_name]
-    if not candidates.empty:
-        address = candidates.iloc[0]["주소"]
+    address = pub_index.get(norm_name)
+    if address is not None:
         debug_msgs.append(f"✅ KPIPA DB 매칭 성공: {name} → {address}")
         return address, debug_msgs
     else:
@@ -3650,23 +4157,15 @@ def search_publisher_location_with_alias(name, publisher_data):
 # =========================
 # --- IM 임프린트 보조 함수 ---
 # =========================
-def find_main_publisher_from_imprints(rep_name, imprint_data, publisher_data):
+def find_main_publisher_from_imprints(rep_name, imprint_index, pub_index):
     """
     IM_* 시트에서 임프린트명을 검색하고, KPIPA DB에서 해당 출판사명으로 주소를 반환
+    imprint_index: load_publisher_db()의 {정규화 임프린트명: 발행처명}
     """
-    norm_rep = normalize_publisher_name(rep_name)
-    for full_text in imprint_data["임프린트"]:
-        if "/" in full_text:
-            pub_part, imprint_part = [p.strip() for p in full_text.split("/", 1)]
-        else:
-            pub_part, imprint_part = full_text.strip(), None
-
-        if imprint_part:
-            norm_imprint = normalize_publisher_name(imprint_part)
-            if norm_imprint == norm_rep:
-                # KPIPA DB에서 pub_part를 검색
-                location, debug_msgs = search_publisher_location_with_alias(pub_part, publisher_data)
-                return location, debug_msgs
+    pub_part = imprint_index.get(normalize_publisher_name(rep_name))
+    if pub_part is not None:
+        # KPIPA DB에서 pub_part를 검색
+        return search_publisher_location_with_alias(pub_part, pub_index)
     return None, [f"❌ IM DB 검색 실패: 매칭되는 임프린트 없음 ({rep_name})"]
 
     
@@ -3674,35 +4173,45 @@ def find_main_publisher_from_imprints(rep_name, imprint_data, publisher_data):
 # =========================
 # --- KPIPA 페이지 검색 ---
 # =========================
-def get_publisher_name_from_isbn_kpipa(isbn):
+# 검색 결과 카드 링크 / 상세 페이지 정의목록(dt·dd)만 파싱
+_KPIPA_RESULT_LINK_ONLY = SoupStrainer("a", class_="book-grid-item")
+_KPIPA_DL_ONLY = SoupStrainer("dl")
+
+@st.cache_data(ttl=24*3600, show_spinner=False)
+def _kpipa_publisher_lookup(isbn):
+    """KPIPA 검색 → 상세 페이지의 '출판사 / 임프린트'
+    (네트워크 예외와 '결과 없음'류(LookupError)는 캐시하지 않고 그대로 올림 → 실제 적중만 캐시)"""
     search_url = "https://bnk.kpipa.or.kr/home/v3/addition/search"
     params = {"ST": isbn, "PG": 1, "PG2": 1, "DSF": "Y", "SO": "weight", "DT": "A"}
     headers = {"User-Agent": "Mozilla/5.0"}
-    def normalize(name):
-        return re.sub(r"\s|\(.*?\)|주식회사|㈜|도서출판|출판사|프레스", "", name).lower()
+    res = SESSION.get(search_url, params=params, headers=headers, timeout=15)
+    res.raise_for_status()
+    soup = BeautifulSoup(res.text, _BS_PARSER, parse_only=_KPIPA_RESULT_LINK_ONLY)
+    first_result_link = soup.select_one("a.book-grid-item")
+    if not first_result_link:
+        raise LookupError("❌ 검색 결과 없음 (KPIPA)")
+    detail_href = first_result_link.get("href")
+    detail_url = f"https://bnk.kpipa.or.kr{detail_href}"
+    detail_res = SESSION.get(detail_url, headers=headers, timeout=15)
+    detail_res.raise_for_status()
+    detail_soup = BeautifulSoup(detail_res.text, _BS_PARSER, parse_only=_KPIPA_DL_ONLY)
+    pub_info_tag = detail_soup.find("dt", string="출판사 / 임프린트")
+    if not pub_info_tag:
+        raise LookupError("❌ '출판사 / 임프린트' 항목을 찾을 수 없습니다. (KPIPA)")
+    dd_tag = pub_info_tag.find_next_sibling("dd")
+    if dd_tag:
+        full_text = dd_tag.get_text(strip=True)
+        publisher_name_full = full_text
+        publisher_name_part = publisher_name_full.split("/")[0].strip()
+        publisher_name_norm = _RE_PUB_NORM_KPIPA.sub("", publisher_name_part).lower()
+        return publisher_name_full, publisher_name_norm, None
+    raise LookupError("❌ 'dd' 태그에서 텍스트를 추출할 수 없습니다. (KPIPA)")
+
+def get_publisher_name_from_isbn_kpipa(isbn):
     try:
-        res = requests.get(search_url, params=params, headers=headers, timeout=15)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, "html.parser")
-        first_result_link = soup.select_one("a.book-grid-item")
-        if not first_result_link:
-            return None, None, "❌ 검색 결과 없음 (KPIPA)"
-        detail_href = first_result_link.get("href")
-        detail_url = f"https://bnk.kpipa.or.kr{detail_href}"
-        detail_res = requests.get(detail_url, headers=headers, timeout=15)
-        detail_res.raise_for_status()
-        detail_soup = BeautifulSoup(detail_res.text, "html.parser")
-        pub_info_tag = detail_soup.find("dt", string="출판사 / 임프린트")
-        if not pub_info_tag:
-            return None, None, "❌ '출판사 / 임프린트' 항목을 찾을 수 없습니다. (KPIPA)"
-        dd_tag = pub_info_tag.find_next_sibling("dd")
-        if dd_tag:
-            full_text = dd_tag.get_text(strip=True)
-            publisher_name_full = full_text
-            publisher_name_part = publisher_name_full.split("/")[0].strip()
-            publisher_name_norm = normalize(publisher_name_part)
-            return publisher_name_full, publisher_name_norm, None
-        return None, None, "❌ 'dd' 태그에서 텍스트를 추출할 수 없습니다. (KPIPA)"
+        return _kpipa_publisher_lookup(isbn)
+    except LookupError as e:
+        return None, None, str(e)
     except Exception as e:
         return None, None, f"KPIPA 예외: {e}"
 
@@ -3710,50 +4219,54 @@ def get_publisher_name_from_isbn_kpipa(isbn):
 # ----발행국 부호 찾기-----
 # =========================
 
-def get_country_code_by_region(region_name, region_data):
+def normalize_region_for_code(region):
+    region = (region or "").strip()
+    if region.startswith(("전라", "충청", "경상")):
+        return region[0] + (region[2] if len(region) > 2 else "")
+    return region[:2]
+
+def get_country_code_by_region(region_name, region_index):
     """
     지역명을 기반으로 008 발행국 부호를 찾음.
-    region_data: DataFrame, columns=["발행국", "발행국 부호"]
+    region_index: load_publisher_db()의 {정규화 지역명: 발행국 부호}
     """
     try:
-        def normalize_region_for_code(region):
-            region = (region or "").strip()
-            if region.startswith(("전라", "충청", "경상")):
-                return region[0] + (region[2] if len(region) > 2 else "")
-            return region[:2]
-        normalized_input = normalize_region_for_code(region_name)
-        for idx, row in region_data.iterrows():
-            sheet_region, country_code = row["발행국"], row["발행국 부호"]
-            if normalize_region_for_code(sheet_region) == normalized_input:
-                return country_code.strip() or "   "
-
-        return "   "
+        return region_index.get(normalize_region_for_code(region_name), "   ")
     except Exception as e:
-        st.write(f"⚠️ get_country_code_by_region 예외: {e}")
+        ui.write(f"⚠️ get_country_code_by_region 예외: {e}")
         return "   "
 
 # =========================
 # --- 문체부 검색 ---
 # =========================
-def get_mcst_address(publisher_name):
+# 검색 결과 페이지에서 결과 표(table.board)만 파싱
+_MCST_BOARD_ONLY = SoupStrainer("table", class_="board")
+
+@st.cache_data(ttl=24*3600, show_spinner=False)
+def _mcst_search_rows(publisher_name):
+    """문체부 출판사 검색 → 영업 중인 (등록구분, 상호, 주소, 상태) 목록 (예외는 캐시하지 않음)"""
     url = "https://book.mcst.go.kr/html/searchList.php"
     params = {"search_area": "전체", "search_state": "1", "search_kind": "1", 
               "search_type": "1", "search_word": publisher_name}
+    res = SESSION.get(url, params=params, timeout=15)
+    res.raise_for_status()
+    soup = BeautifulSoup(res.text, _BS_PARSER, parse_only=_MCST_BOARD_ONLY)
+    results = []
+    for row in soup.select("table.board tbody tr"):
+        cols = row.find_all("td")
+        if len(cols) >= 4:
+            reg_type = cols[0].get_text(strip=True)
+            name = cols[1].get_text(strip=True)
+            address = cols[2].get_text(strip=True)
+            status = cols[3].get_text(strip=True)
+            if status == "영업":
+                results.append((reg_type, name, address, status))
+    return results
+
+def get_mcst_address(publisher_name):
     debug_msgs = []
     try:
-        res = requests.get(url, params=params, timeout=15)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, "html.parser")
-        results = []
-        for row in soup.select("table.board tbody tr"):
-            cols = row.find_all("td")
-            if len(cols) >= 4:
-                reg_type = cols[0].get_text(strip=True)
-                name = cols[1].get_text(strip=True)
-                address = cols[2].get_text(strip=True)
-                status = cols[3].get_text(strip=True)
-                if status == "영업":
-                    results.append((reg_type, name, address, status))
+        results = _mcst_search_rows(publisher_name)
         if results:
             debug_msgs.append(f"[문체부] 검색 성공: {len(results)}건")
             return results[0][2], results, debug_msgs
@@ -3767,22 +4280,24 @@ def get_mcst_address(publisher_name):
 def build_pub_location_bundle(isbn, publisher_name_raw):
     debug = []
     try:
-        publisher_data, region_data, imprint_data = load_publisher_db()
-        debug.append("✓ 구글시트 DB 적재 성공")
-
-        kpipa_full, kpipa_norm, err = get_publisher_name_from_isbn_kpipa(isbn)
+        # 구글시트 DB 적재와 KPIPA 검색(검색→상세 2회 왕복)은 서로 무관 → 동시에
+        with _st_thread_pool(2) as ex:
+            f_kpipa = ex.submit(get_publisher_name_from_isbn_kpipa, isbn)
+            pub_index, region_index, imprint_index = load_publisher_db()
+            debug.append("✓ 구글시트 DB 적재 성공")
+            kpipa_full, kpipa_norm, err = f_kpipa.result()
         if err: debug.append(f"KPIPA 검색: {err}")
 
         rep_name, aliases = split_publisher_aliases(kpipa_full or publisher_name_raw or "")
         resolved_pub_for_search = rep_name or (publisher_name_raw or "").strip()
         debug.append(f"대표 출판사명 추정: {resolved_pub_for_search} | ALIAS: {aliases}")
 
-        place_raw, msgs = search_publisher_location_with_alias(resolved_pub_for_search, publisher_data)
+        place_raw, msgs = search_publisher_location_with_alias(resolved_pub_for_search, pub_index)
         debug += msgs
         source = "KPIPA_DB"
 
         if place_raw in ("출판지 미상", "예외 발생", None):
-            place_raw, msgs = find_main_publisher_from_imprints(resolved_pub_for_search, imprint_data, publisher_data)
+            place_raw, msgs = find_main_publisher_from_imprints(resolved_pub_for_search, imprint_index, pub_index)
             debug += msgs
             if place_raw: source = "IMPRINT→KPIPA"
 
@@ -3797,7 +4312,7 @@ def build_pub_location_bundle(isbn, publisher_name_raw):
             debug.append("⚠️ 모든 경로 실패 → '출판지 미상'")
 
         place_display = normalize_publisher_location_for_display(place_raw)
-        country_code = get_country_code_by_region(place_raw, region_data)
+        country_code = get_country_code_by_region(place_raw, region_index)
 
         return {
             "place_raw": place_raw,
@@ -3817,24 +4332,35 @@ def build_pub_location_bundle(isbn, publisher_name_raw):
             "debug": [f"예외: {e}"],
         }
 
-def build_260(place_display: str, publisher_name: str, pubyear: str):
+def build_260(place_display: str, publisher_name: str, pubyear: str) -> tuple:
+    """260 발행사항 → (Field, MRK)"""
     place = (place_display or "발행지 미상")
     pub = (publisher_name or "발행처 미상")
     year = (pubyear or "발행년 미상")
-    return f"=260  \\\\$a{place} :$b{pub},$c{year}"
+    return make_field("260", " ", " ", [("a", f"{place} :"), ("b", f"{pub},"), ("c", year)])
+
+# 008 입력일(YYMMDD): 날짜가 바뀔 때만 strftime
+_today_cache = [None, ""]
+
+def _today_yymmdd() -> str:
+    t = time.localtime()
+    key = (t.tm_year, t.tm_yday)
+    if _today_cache[0] != key:
+        _today_cache[1] = time.strftime("%y%m%d", t)
+        _today_cache[0] = key
+    return _today_cache[1]
 
-def _today_yymmdd():
-    return datetime.now().strftime("%y%m%d")
+_RE_YEAR4 = re.compile(r"\d{4}")
 
 def _derive_date1(pubyear: str) -> str:
     y = (pubyear or "").strip()
-    return y[:4] if re.fullmatch(r"\d{4}", y) else "19uu"
+    return y[:4] if _RE_YEAR4.fullmatch(y) else "19uu"
 
 # ==========================================================================================
 # 056 단독 코드
 # ==========================================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)  # 생성 후 읽기 전용 → 인스턴스 __dict__ 없이 슬롯으로
 class BookInfo:
     title: str = ""
     author: str = ""
@@ -3846,17 +4372,22 @@ class BookInfo:
     toc: str = ""
     extra: Optional[Dict[str, Any]] = None
 # ───────── 유틸 ─────────
+_RE_KDC_NUMBER = re.compile(r"\b([0-9]{1,3}(?:\.[0-9]+)?)\b")
+_RE_KDC_INT_HEAD = re.compile(r"(\d{1,3})")
+# 따옴표 안의 '>'(속성값)까지 태그로 묶어서 제거
+_RE_HTML_TAG = re.compile(r"""<(?:[^>"']|"[^"]*"|'[^']*')+>""")
+
 def clean_text(s: Optional[str]) -> str:
     if not s:
         return ""
-    s = html.unescape(s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+    # 공백 묶음 → 한 칸 + 양끝 제거를 str.split()/join(C 루프)으로 (\s 와 공백 판정 동일)
+    return " ".join(html.unescape(s).split())
+
 def first_match_number(text: str) -> Optional[str]:
     """KDC 숫자만 추출: 0~999 또는 소수점 포함(예: 813.7)"""
     if not text:
         return None
-    m = re.search(r"\b([0-9]{1,3}(?:\.[0-9]+)?)\b", text)
+    m = _RE_KDC_NUMBER.search(text)
     return m.group(1) if m else None
     
     # ⬇️ 추가: 소수점 응답을 받아도 정수부만 반환
@@ -3867,17 +4398,20 @@ def normalize_kdc_3digit(code: Optional[str]) -> Optional[str]:
     """
     if not code:
         return None
-    m = re.search(r"(\d{1,3})", code)
+    m = _RE_KDC_INT_HEAD.search(code)
     return m.group(1) if m else None
     
 def first_or_empty(lst):
     return lst[0] if lst else ""
 def strip_tags(html_text: str) -> str:
-    return re.sub(r"<[^>]+>", " ", html_text)
+    # 알라딘 필드는 대부분 이미 평문 → '<'가 없으면 정규식 없이 그대로 반환
+    if not html_text or "<" not in html_text:
+        return html_text or ""
+    return _RE_HTML_TAG.sub(" ", html_text)
 # ───────── 1) 알라딘 API 우선 ─────────
-def aladin_lookup_by_api(isbn13: str, ttbkey: str) -> Optional[BookInfo]:
-    if not ttbkey:
-        return None
+@st.cache_data(ttl=24*3600, show_spinner=False)
+def _aladin_itemlookup_items(isbn13: str, ttbkey: str) -> list:
+    """ItemLookUp 응답의 item 목록 (HTTP/JSON 오류·errorCode·결과 없음은 예외로 올려 캐시되지 않게 함)"""
     params = {
         "ttbkey": ttbkey,
         "itemIdType": "ISBN13",
@@ -3886,16 +4420,28 @@ def aladin_lookup_by_api(isbn13: str, ttbkey: str) -> Optional[BookInfo]:
         "Version": "20131101",
         "OptResult": "authors,categoryName,fulldescription,toc,packaging,ratings"
     }
+    r = SESSION.get("https://www.aladin.co.kr/ttb/api/ItemLookUp.aspx", params=params, headers=HEADERS, timeout=15)
+    r.raise_for_status()
+    data = _json_loads(r.content)
+    if not isinstance(data, dict) or data.get("errorCode"):
+        raise RuntimeError(f"ItemLookUp 오류: {data.get('errorMessage') if isinstance(data, dict) else data!r}")
+    items = data.get("item") or []
+    if not items:
+        raise LookupError("알라딘 API(ItemLookUp)에서 결과 없음")
+    return items
+
+@st.cache_data(ttl=24*3600, show_spinner=False)
+def _aladin_page_text(url: str, params: dict | None = None) -> str:
+    """알라딘 검색/상품 페이지 HTML (실패는 예외로 올려 캐시되지 않게 함)"""
+    r = SESSION.get(url, params=params, headers=HEADERS, timeout=15)
+    r.raise_for_status()
+    return r.text
+
+def aladin_lookup_by_api(isbn13: str, ttbkey: str) -> Optional[BookInfo]:
+    if not ttbkey:
+        return None
     try:
-        r = requests.get("https://www.aladin.co.kr/ttb/api/ItemLookUp.aspx", params=params, headers=HEADERS, timeout=15)
-        r.raise_for_status()
-        data = r.json()
-        items = data.get("item", [])
-        if not items:
-            # 디버그: API가 비어있으면 이유를 화면에서 확인할 수 있게
-            st.info("알라딘 API(ItemLookUp)에서 결과 없음 → 스크레이핑 백업 시도")
-            return None
-        it = items[0]
+        it = _aladin_itemlookup_items(isbn13, ttbkey)[0]
         return BookInfo(
             title=clean_text(it.get("title")),
             author=clean_text(it.get("author")),
@@ -3907,51 +4453,51 @@ def aladin_lookup_by_api(isbn13: str, ttbkey: str) -> Optional[BookInfo]:
             toc=clean_text(it.get("toc")),
             extra=it,
         )
+    except LookupError:
+        # 디버그: API가 비어있으면 이유를 화면에서 확인할 수 있게
+        ui.info("알라딘 API(ItemLookUp)에서 결과 없음 → 스크레이핑 백업 시도")
+        return None
     except Exception as e:
-        st.info(f"알라딘 API 호출 예외 → {e} / 스크레이핑 백업 시도")
+        ui.info(f"알라딘 API 호출 예외 → {e} / 스크레이핑 백업 시도")
         return None
 # ───────── 2) 알라딘 웹 스크레이핑(백업) ─────────
 def aladin_lookup_by_web(isbn13: str) -> Optional[BookInfo]:
     try:
         # 검색 URL (Book 타겟 우선)
         params = {"SearchTarget": "Book", "SearchWord": f"isbn:{isbn13}"}
-        sr = requests.get(ALADIN_SEARCH_URL, params=params, headers=HEADERS, timeout=15)
-        sr.raise_for_status()
-        soup = BeautifulSoup(sr.text, "html.parser")
+        sr_text = _aladin_page_text(ALADIN_SEARCH_URL, params)
+        soup = BeautifulSoup(sr_text, _BS_PARSER)
         # 1) 가장 안정적인 카드 타이틀 링크 (a.bo3)
         link_tag = soup.select_one("a.bo3")
         item_url = None
         if link_tag and link_tag.get("href"):
-            item_url = urllib.parse.urljoin("https://www.aladin.co.kr", link_tag["href"])
+            item_url = urljoin("https://www.aladin.co.kr", link_tag["href"])
         # 2) 백업: 정규식으로 wproduct 링크 잡기(쌍/홑따옴표 모두)
         if not item_url:
-            m = re.search(r'href=[\'"](/shop/wproduct\.aspx\?ItemId=\d+[^\'"]*)[\'"]', sr.text, re.I)
+            m = re.search(r'href=[\'"](/shop/wproduct\.aspx\?ItemId=\d+[^\'"]*)[\'"]', sr_text, re.I)
             if m:
-                item_url = urllib.parse.urljoin("https://www.aladin.co.kr", html.unescape(m.group(1)))
+                item_url = urljoin("https://www.aladin.co.kr", html.unescape(m.group(1)))
         # 3) 그래도 없으면, 첫 상품 카드 내 다른 링크 시도
         if not item_url:
             first_card = soup.select_one(".ss_book_box, .ss_book_list")
             if first_card:
                 a = first_card.find("a", href=True)
                 if a:
-                    item_url = urllib.parse.urljoin("https://www.aladin.co.kr", a["href"])
+                    item_url = urljoin("https://www.aladin.co.kr", a["href"])
         if not item_url:
-            st.warning("알라딘 검색 페이지에서 상품 링크를 찾지 못했습니다.")
-            with st.expander("디버그: 검색 페이지 HTML 일부"):
-                st.code(sr.text[:2000])
+            ui.warning("알라딘 검색 페이지에서 상품 링크를 찾지 못했습니다.")
+            with ui.expander("디버그: 검색 페이지 HTML 일부"):
+                ui.code(sr_text[:2000])
             return None
         # 상품 상세 페이지 요청
-        pr = requests.get(item_url, headers=HEADERS, timeout=15)
-        pr.raise_for_status()
-        psoup = BeautifulSoup(pr.text, "html.parser")
+        psoup = BeautifulSoup(_aladin_page_text(item_url), _BS_PARSER)
         # 메타 태그로 기본 정보 확보
         og_title = psoup.select_one('meta[property="og:title"]')
         og_desc  = psoup.select_one('meta[property="og:description"]')
         title = clean_text(og_title["content"]) if og_title and og_title.has_attr("content") else ""
         desc  = clean_text(og_desc["content"]) if og_desc and og_desc.has_attr("content") else ""
-        # 본문 텍스트 백업(길이 제한)
-        body_text = clean_text(psoup.get_text(" "))[:4000]
-        description = desc or body_text
+        # 본문 텍스트 백업(길이 제한): og:description이 없을 때만 페이지 전체 텍스트를 만듦
+        description = desc or clean_text(psoup.get_text(" "))[:4000]
         # 저자/출판사/출간일 추출(있으면)
         author = ""
         publisher = ""
@@ -3973,8 +4519,8 @@ def aladin_lookup_by_web(isbn13: str) -> Optional[BookInfo]:
         if crumbs:
             cat_text = clean_text(" > ".join(c.get_text(" ") for c in crumbs))
         # 디버그: 어느 링크로 들어갔는지/타이틀 확인
-        with st.expander("디버그: 스크레이핑 진입 URL / 파싱 결과"):
-            st.write({"item_url": item_url, "title": title})
+        with ui.expander("디버그: 스크레이핑 진입 URL / 파싱 결과"):
+            ui.write({"item_url": item_url, "title": title})
         
         return BookInfo(
             title=title,
@@ -3986,9 +4532,10 @@ def aladin_lookup_by_web(isbn13: str) -> Optional[BookInfo]:
             category=cat_text
         )
     except Exception as e:
-        st.error(f"웹 스크레이핑 예외: {e}")
+        ui.error(f"웹 스크레이핑 예외: {e}")
         return None
 # --- 041 원작언어 기반 문학 분류 재정렬(후처리) ---------------------------------
+
 def _parse_marc_041_original(marc041: str):
     """
     MARC 041에서 원작 언어($h)를 3글자 코드로 추출.
@@ -3996,26 +4543,33 @@ def _parse_marc_041_original(marc041: str):
     """
     if not marc041:
         return None
-    s = str(marc041).lower()
-    import re
-    m = re.search(r"\$h([a-z]{3})", s)
-    return m.group(1) if m else None
+    s = str(marc041).replace("$H", "$h")
+    i = s.find("$h")
+    while i >= 0:
+        cand = s[i + 2:i + 5].lower()
+        if len(cand) == 3 and cand.isascii() and cand.isalpha():
+            return cand
+        i = s.find("$h", i + 2)
+    return None
+# 원작 언어코드 → KDC 문학 계열(8xx), 목록에 없으면 890(기타 제문학)
+_KDC_LIT_BASE = {
+    "kor": "810",                 # 한국문학
+    "chi": "820", "zho": "820",   # 중국문학 (홍콩/대만 포함)
+    "jpn": "830",                 # 일본문학
+    "eng": "840",                 # 영미문학
+    "deu": "850", "ger": "850",   # 독일문학
+    "fre": "860",                 # 프랑스문학
+    "spa": "870", "por": "870",   # 스페인/포르투갈문학
+    "ita": "880",                 # 이탈리아문학
+}
+
 def _lang3_to_kdc_lit_base(lang3: str):
     """
     원작 언어코드 -> 문학 계열(8xx) 매핑.
     """
     if not lang3:
         return None
-    l = lang3.lower()
-    if l in {"eng"}: return "840"  # 영미문학
-    if l in {"kor"}: return "810"  # 한국문학
-    if l in {"chi", "zho"}: return "820"  # 중국문학 (홍콩/대만 포함)
-    if l in {"jpn"}: return "830"  # 일본문학
-    if l in {"deu", "ger"}: return "850"  # 독일문학
-    if l in {"fre"}: return "860"  # 프랑스문학
-    if l in {"spa", "por"}: return "870"  # 스페인/포르투갈문학
-    if l in {"ita"}: return "880"  # 이탈리아문학
-    return "890"  # 기타 제문학
+    return _KDC_LIT_BASE.get(lang3.lower(), "890")
 def _rebase_8xx_with_language(code: str, marc041: str) -> str:
     """
     code가 문학(8xx)이면, 041 $h(원작언어)에 따라 81x/82x/83x/84x…의 '앞 두 자리'를 재정렬.
@@ -4028,22 +4582,24 @@ def _rebase_8xx_with_language(code: str, marc041: str) -> str:
     base = _lang3_to_kdc_lit_base(orig) if orig else None
     if not base:
         return code
-    import re
-    m = re.match(r"^(\d{3})(\..+)?$", code)
-    if not m:
+    head3, tail = code[:3], code[3:]
+    if not (head3.isascii() and head3.isdigit()):
+        return code
+    if tail and (tail[0] != "." or len(tail) < 2):
         return code
-    head3, tail = m.group(1), (m.group(2) or "")
     genre = head3[2]  # 세번째 자리: 시/희곡/소설/…
     new_head3 = base[:2] + genre
     return new_head3 + tail
 # ---------------------------------------------------------------------------
 # ───────── 3) 챗G에게 'KDC 숫자만' 요청 (직접분류추천 지원 버전) ─────────
 def ask_llm_for_kdc(book: BookInfo, api_key: str, model: str = DEFAULT_MODEL,
-                    keywords_hint: list[str] | None = None) -> Optional[str]:
+                    keywords_hint: list[str] | None = None,
+                    slim_payload: bool = False) -> Optional[str]:
     """
     KDC(056) 판단용 LLM 호출 (C전략)
     - '직접분류추천' 안전장치: 확신이 없으면 이 문자열을 그대로 출력하도록 유도
     - 입력 축약, 2단계 폴백, 파싱 보강 포함
+    - slim_payload=True: 분류에 거의 도움이 안 되는 isbn13/publisher/pub_date는 빼고 전송(토큰 절감)
     - 반환: '숫자만'(예: '823','813.7') 또는 '직접분류추천'
     """
     if model is None:
@@ -4075,6 +4631,11 @@ def ask_llm_for_kdc(book: BookInfo, api_key: str, model: str = DEFAULT_MODEL,
         "description": description,
         "toc": toc,
     }
+    if slim_payload:
+        for k in ("isbn13", "publisher", "pub_date"):
+            payload.pop(k, None)
+    # 들여쓰기 없는 compact JSON (토큰 절약)
+    payload_json = _json_dumps_compact(payload)
     # 메인 시스템 프롬프트 (C안 + 강목표 + 세분 규칙 + '직접분류추천' 규정)
     sys_prompt = (
         "너는 한국십진분류법(KDC) 전문가이자 공공도서관 분류 사서이다.\n"
@@ -4121,7 +4682,7 @@ def ask_llm_for_kdc(book: BookInfo, api_key: str, model: str = DEFAULT_MODEL,
         "만약 확실히 판단하기 어렵다면 **정확히 '직접분류추천'**만 출력하라.\n\n"
         f"※ 참고용 키워드 힌트(653): {hint_str or '(없음)'}\n"
         "이 힌트는 보조 신호일 뿐이며, 제목·목차·설명·카테고리 등의 원자료 및 KDC 규칙과 상충할 경우 무시해야 한다.\n\n"
-        f"{json.dumps(payload, ensure_ascii=False, indent=2)}\n\n"
+        f"{payload_json}\n\n"
         "출력 예시: 823 / 813 / 325 / 181 / (확신없음) 직접분류추천"
     )
     # 파서: 숫자(소수점 불허, 정수 3자리 고정) 또는 '직접분류추천' 인식
@@ -4141,33 +4702,44 @@ def ask_llm_for_kdc(book: BookInfo, api_key: str, model: str = DEFAULT_MODEL,
         if not re.fullmatch(r"\d{3}", num):
             return None
         return num
-        
+
+    # 041 원작언어 → 문학 계열(8xx) 기준은 도서별로 고정 → 호출/재시도마다 다시 파싱하지 않음
+    #    (BookInfo에 041 필드명이 다를 수 있어 안전하게 시도)
+    marc041 = getattr(book, "marc041", "") or getattr(book, "field_041", "") or getattr(book, "f041", "")
+    lit_base = _lang3_to_kdc_lit_base(_parse_marc_041_original(marc041))
+
     def _call_llm(sys_p: str, user_p: str, max_tokens: int) -> Optional[str]:
-        resp = requests.post(
-            OPENAI_CHAT_COMPLETIONS,
-            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-            json={
-                "model": model,
-                "messages": [
-                    {"role": "system", "content": sys_p},
-                    {"role": "user", "content": user_p},
-                ],
-                "temperature": 0.0,
-                "max_tokens": max_tokens,
-            },
-            timeout=45,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        text = (data["choices"][0]["message"]["content"] or "").strip()
+        # 같은 프롬프트(=같은 도서 정보+힌트)면 디스크 캐시(SQLite)의 응답 재사용 (temperature 0)
+        ck = "gptkdc|" + hashlib.sha256(f"{model}\n{max_tokens}\n{sys_p}\n{user_p}".encode("utf-8")).hexdigest()
+        text = cache_get(ck)
+        if not (isinstance(text, str) and text):
+            resp = SESSION.post(
+                OPENAI_CHAT_COMPLETIONS,
+                headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+                json={
+                    "model": model,
+                    "messages": [
+                        {"role": "system", "content": sys_p},
+                        {"role": "user", "content": user_p},
+                    ],
+                    "temperature": 0.0,
+                    "max_tokens": max_tokens,
+                },
+                timeout=45,
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            text = (data["choices"][0]["message"]["content"] or "").strip()
+            if _parse_response(text):  # 파싱 가능한 응답만 저장 (불량 응답이 굳지 않게)
+                cache_set(ck, text)
         # 1) 숫자 파싱
         code = _parse_response(text)
         if not code:
             return None
-        # 2) 041 원작언어 기반 문학 계열 재정렬 (있을 경우만 적용)
-        #    (BookInfo에 041 필드명이 다를 수 있어 안전하게 시도)
-        marc041 = getattr(book, "marc041", "") or getattr(book, "field_041", "") or getattr(book, "f041", "")
-        code = _rebase_8xx_with_language(code, marc041)
+        # 2) 041 원작언어 기반 문학 계열 재정렬 (있을 경우만 적용, 장르 자리는 보존)
+        #    code는 _parse_response에서 3자리 정수로 검증됨 → _rebase_8xx_with_language와 동일 결과
+        if lit_base and code[0] == "8":
+            code = lit_base[:2] + code[2:]
         # 3) 최종 반환
         return code
         
@@ -4177,7 +4749,7 @@ def ask_llm_for_kdc(book: BookInfo, api_key: str, model: str = DEFAULT_MODEL,
         if code:
             return code
     except Exception as e:
-        st.warning(f"1차 LLM 호출 경고: {e}")
+        ui.warning(f"1차 LLM 호출 경고: {e}")
     # 2차: 폴백(3자리 정수 또는 '직접분류추천')
     fb_sys = (
         "너는 KDC 제6판 기준 분류 사서다. "
@@ -4185,29 +4757,34 @@ def ask_llm_for_kdc(book: BookInfo, api_key: str, model: str = DEFAULT_MODEL,
         "정확히 판단하기 어렵다면 **정확히 '직접분류추천'** 글자만 출력하라. "
         "다른 문자는 금지."
     )
-    fb_user = f"도서 정보:\n{json.dumps(payload, ensure_ascii=False, indent=2)}"
+    fb_user = f"도서 정보:\n{payload_json}"
     try:
         code = _call_llm(fb_sys, fb_user, max_tokens=8)
         if code:
             return code
     except Exception as e:
-        st.error(f"2차 LLM 호출 오류: {e}")
+        ui.error(f"2차 LLM 호출 오류: {e}")
     # 3차: 로컬 폴백 — 그래도 못 받으면 '직접분류추천'
     return "직접분류추천"
 
 # ───────── 4) 파이프라인 ─────────
-def get_kdc_from_isbn(isbn13: str, ttbkey: Optional[str], openai_key: str, model: str,
-                      keywords_hint: list[str] | None = None) -> Optional[str]:
+def _kdc_aladin_phase(isbn13: str, ttbkey: Optional[str]) -> Optional[BookInfo]:
+    """KDC 1단계: 알라딘 API → 실패 시 웹 스크레이핑 (653 키워드와 무관하므로 먼저 시작 가능)"""
     info = aladin_lookup_by_api(isbn13, ttbkey) if ttbkey else None
     if not info:
         info = aladin_lookup_by_web(isbn13)
+    return info
+
+def _kdc_classify_phase(info: Optional[BookInfo], openai_key: str, model: str,
+                        keywords_hint: list[str] | None = None) -> Optional[str]:
+    """KDC 2단계: 1단계 BookInfo + 653 키워드 힌트로 LLM 분류"""
     if not info:
-        st.warning("알라딘에서 도서 정보를 찾지 못했습니다.")
+        ui.warning("알라딘에서 도서 정보를 찾지 못했습니다.")
         return None
     code = ask_llm_for_kdc(info, api_key=openai_key, model=model, keywords_hint=keywords_hint)
     # 디버그용: 어떤 정보를 넘겼는지 보여주기(개인정보 없음)
-    with st.expander("LLM 입력 정보(확인용)"):
-        st.json({
+    with ui.expander("LLM 입력 정보(확인용)"):
+        ui.json({
             "title": info.title,
             "author": info.author,
             "publisher": info.publisher,
@@ -4219,46 +4796,25 @@ def get_kdc_from_isbn(isbn13: str, ttbkey: Optional[str], openai_key: str, model
         })
     return code
 
-# (김: 추가) mrc 파일 생성 (객체변환)
-def mrk_str_to_field(line):
-    # 0) None/빈 값
-    if line is None:
-        return None
-
-    # 1) 이미 Field 유사 객체면 그대로 반환 (덕타이핑)
-    try:
-        if getattr(line, "tag", None) is not None and (hasattr(line, "data") or hasattr(line, "subfields")):
-            return line
-    except Exception:
-        pass
+def get_kdc_from_isbn(isbn13: str, ttbkey: Optional[str], openai_key: str, model: str,
+                      keywords_hint: list[str] | None = None) -> Optional[str]:
+    info = _kdc_aladin_phase(isbn13, ttbkey)
+    return _kdc_classify_phase(info, openai_key=openai_key, model=model, keywords_hint=keywords_hint)
 
-    # 2) 문자열 확보 (아니면 str() 시도)
-    if not isinstance(line, str):
-        try:
-            line = str(line)
-        except Exception:
-            return None
-    
+def _parse_mrk_str(line: str):
+    """'=TTT  II$a...' 한 줄 → Field (형식이 아니면 None)"""
     s = line.strip()
     if not s.startswith("=") or len(s) < 8:
         return None
 
-    # 3) 태그/인디케이터/본문 분해 (정규식으로 확정적으로 자르기)
-    m = re.match(r"^=(\d{3})\s{2}(.)(.)(.*)$", s)
-    if m:
-        tag, ind1_raw, ind2_raw, tail = m.groups()
-    else:
-        # 컨트롤필드 (=008  <data>) 패턴
-        m_ctl = re.match(r"^=(\d{3})\s\s(.*)$", s)
-        if not m_ctl:
-            return None
-        tag, data = m_ctl.group(1), m_ctl.group(2).strip()
-        if tag.isdigit() and int(tag) < 10:
-            return Field(tag=tag, data=data) if data else None
+    # 3) 태그/인디케이터/본문 분해 (고정 레이아웃 '=TTT  II...' → 슬라이싱)
+    tag = s[1:4]
+    if not tag.isdigit() or not s[4:6].isspace():
         return None
+    ind1_raw, ind2_raw, tail = s[6], s[7], s[8:]
 
-    # 4) 컨트롤필드
-    if tag.isdigit() and int(tag) < 10:
+    # 4) 컨트롤필드 (tag.isdigit()은 위에서 확인됨)
+    if int(tag) < 10:
         data = (ind1_raw + ind2_raw + tail).strip()
         return Field(tag=tag, data=data) if data else None
 
@@ -4271,28 +4827,59 @@ def mrk_str_to_field(line):
         return None  # 서브필드 없으면 의미없음
 
     # 6) 서브필드 파싱 ($a...$b...$I... 대소문자 코드 모두 허용)
+    #    '$' 기준 split(C 구현) 후 첫 조각(첫 '$' 앞)은 버림
     subfields = []
-    i, L = 0, len(subs_part)
-    while i < L:
-        if subs_part[i] != "$":
-            i += 1
+    for p in subs_part.split("$")[1:]:
+        if len(p) < 2:
             continue
-        if i + 1 >= L:
-            break
-        code = subs_part[i + 1]
-        j = i + 2
-        while j < L and subs_part[j] != "$":
-            j += 1
-        value = subs_part[i + 2:j].strip()
-        if code and value:
-            subfields.append(Subfield(code, value))
-        i = j
+        value = p[1:].strip()
+        if value:
+            subfields.append(Subfield(p[0], value))
 
     if not subfields:
         return None
 
     return Field(tag=tag, indicators=[ind1, ind2], subfields=subfields)
 
+def make_field(tag: str, ind1: str, ind2: str, subs: list[tuple[str, str]]) -> tuple:
+    """(코드, 값) 목록 → (Field, MRK) 쌍을 바로 생성 (MRK 문자열 재파싱 없이)"""
+    i1 = "\\" if ind1 == " " else ind1  # MRK 표기: 공백 인디케이터 → '\'
+    i2 = "\\" if ind2 == " " else ind2
+    mrk = f"={tag}  {i1}{i2}" + "".join(f"${c}{v}" for c, v in subs)
+    vals = [(v or "").strip() for _, v in subs]
+    if not all(vals) or any("$" in v for v in vals):  # 빈 값/서브필드 구분자 포함 → 파서 결과와 똑같이 맞추려고 파서로
+        return _parse_mrk_str(mrk), mrk
+    return Field(tag=tag, indicators=[ind1, ind2], subfields=[Subfield(c, v) for (c, _), v in zip(subs, vals)]), mrk
+
+def _a_field_pair(tag: str, ind1: str, ind2: str, value: str) -> tuple:
+    """$a 하나짜리 필드 → (Field, MRK)"""
+    return make_field(tag, ind1, ind2, [("a", value)])
+
+# (김: 추가) mrc 파일 생성 (객체변환)
+def mrk_str_to_field(line):
+    # 대부분의 호출은 str → 덕타이핑 검사 없이 바로 파싱
+    if type(line) is str:
+        return _parse_mrk_str(line)
+
+    # 0) None/빈 값
+    if line is None:
+        return None
+
+    # 1) 이미 Field 유사 객체면 그대로 반환 (덕타이핑)
+    try:
+        if getattr(line, "tag", None) is not None and (hasattr(line, "data") or hasattr(line, "subfields")):
+            return line
+    except Exception:
+        pass
+
+    # 2) 문자열 확보 (str 하위클래스 포함, 아니면 str() 시도)
+    try:
+        line = str(line)
+    except Exception:
+        return None
+    return _parse_mrk_str(line)
+
+
 def build_490_830_mrk_from_item(item):
     """
     알라딘 item에서 총서명/권호를 추출해
@@ -4360,11 +4947,20 @@ def detect_illustrations(text: str):
     else:
         return False, None
 
+# 형태사항: 숫자 / 가로x세로(mm)  (쪽수 항목은 endswith로 판별)
+_RE_300_NUM = re.compile(r"\d+")
+_RE_300_SIZE = re.compile(r"(\d+)\s*[\*x×X]\s*(\d+)")
+
+# 제목/부제/책소개/형태사항 노드만 파싱 (상세 페이지 전체 트리 방지)
+_ALADIN_DETAIL_300_ONLY = SoupStrainer(
+    ["span", "div"], class_=["Ere_bo_title", "Ere_sub1_title", "Ere_prod_mconts_R", "conts_info_list1"]
+)
+
 def parse_aladin_physical_book_info(html):
     """
     알라딘 상세 페이지 HTML에서 300 필드 파싱
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, _BS_PARSER, parse_only=_ALADIN_DETAIL_300_ONLY)
 
     # -------------------------------
     # 제목, 부제, 책소개
@@ -4390,18 +4986,18 @@ def parse_aladin_physical_book_info(html):
     size_value = None
 
     if form_wrap:
-        form_items = [item.strip() for item in form_wrap.stripped_strings if item.strip()]
-        for item in form_items:
-            if re.search(r"(쪽|p)\s*$", item):
-                page_match = re.search(r"\d+", item)
+        # stripped_strings는 이미 strip된 비어 있지 않은 문자열만 줌 → 끝 글자 검사로 '(쪽|p)\s*$' 대체
+        for item in form_wrap.stripped_strings:
+            if item.endswith(("쪽", "p")):
+                page_match = _RE_300_NUM.search(item)
                 if page_match:
-                    page_value = int(page_match.group())
-                    a_part = f"{page_match.group()} p."
+                    page_value = int(page_match[0])
+                    a_part = f"{page_match[0]} p."
             elif "mm" in item:
-                size_match = re.search(r"(\d+)\s*[\*x×X]\s*(\d+)", item)
+                size_match = _RE_300_SIZE.search(item)
                 if size_match:
-                    width = int(size_match.group(1))
-                    height = int(size_match.group(2))
+                    width = int(size_match[1])
+                    height = int(size_match[2])
                     size_value = f"{width}x{height}mm"
                     if width == height or width > height or width < height / 2:
                         w_cm = math.ceil(width / 10)
@@ -4484,11 +5080,14 @@ def parse_aladin_physical_book_info(html):
     }
 
 
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _aladin_detail_parsed(link: str) -> dict:
+    """상세 페이지 300 파싱 결과 (같은 링크면 재파싱 없이 사본 반환, 실패는 예외로 올려 캐시하지 않음)"""
+    return parse_aladin_physical_book_info(_fetch_aladin_html(link))
+
 def search_aladin_detail_page(link):
     try:
-        res = requests.get(link, timeout=15)
-        res.raise_for_status()
-        return parse_aladin_physical_book_info(res.text), None
+        return _aladin_detail_parsed(link), None
     except Exception as e:
         return {
             "300": "=300  \\$a1책. [상세 페이지 파싱 오류]",
@@ -4562,17 +5161,45 @@ def build_300_mrk(item: dict) -> str:
 # ============================================
 # 📌 타임라인 기록 기능
 # ============================================
-TIMELINE = []
-
-def log_time(label, start_time):
+def log_time(timeline: list, label, start_time):
+    """timeline(레코드별 목록)에 단계 소요 시간 추가 — 전역 목록을 쓰지 않아 동시 처리에서도 섞이지 않음"""
     import time
     elapsed = time.perf_counter() - start_time
-    TIMELINE.append({
+    timeline.append({
         "step": label,
         "time_sec": round(elapsed, 4)
     })
 
 
+# ============================================
+# 📌 알라딘 item 필드 뷰 (원클릭 파이프라인에서 반복 조회 방지)
+# ============================================
+@dataclass(slots=True)
+class AladinView:
+    title: str
+    category: str
+    author: str
+    description: str
+    toc: str
+    publisher: str
+    pubdate: str
+    price: str
+
+def _view(item: dict | None) -> AladinView:
+    item = item or {}
+    sub = item.get("subInfo") or {}
+    return AladinView(
+        title=item.get("title", "") or "",
+        category=item.get("categoryName", "") or "",
+        author=item.get("author", "") or "",
+        description=item.get("description", "") or "",
+        toc=sub.get("toc", "") or "",
+        publisher=item.get("publisher", "") or "",
+        pubdate=item.get("pubDate", "") or "",
+        price=str(item.get("priceStandard", "") or ""),
+    )
+
+
 # ============================================
 # 📌 generate_all_oneclick()
 # ============================================
@@ -4581,15 +5208,16 @@ def generate_all_oneclick(
     reg_mark: str = "", 
     reg_no: str = "", 
     copy_symbol: str = "", 
-    use_ai_940: bool = True
+    use_ai_940: bool = True,
+    return_marc_bytes: bool = True,
 ):
+    """return_marc_bytes=False 이면 ISO2709 직렬화(as_marc)를 건너뛰고 marc_bytes=None 반환"""
     import time
-    global TIMELINE
-    TIMELINE = []   # 처리 시마다 초기화
+    timeline: list[dict] = []   # 처리 시마다 새 목록 (meta["timeline"]으로 반환)
 
     mb = MarcBuilder()
     marc_rec = Record(to_unicode=True, force_utf8=True)
-    meta = {"sources": {}, "notes": [], "provenance": {}}
+    meta = {"sources": {}, "notes": [], "provenance": {}, "timeline": timeline}
 
     pieces = []
 
@@ -4598,14 +5226,26 @@ def generate_all_oneclick(
     # --------------------------------------------
     t = time.perf_counter()
     author_raw, _ = fetch_nlk_author_only(isbn)
-    log_time("NLK 저자 조회", t)
+    log_time(timeline, "NLK 저자 조회", t)
 
     # --------------------------------------------
     # 2) 알라딘 API 기본 Item 조회
     # --------------------------------------------
     t = time.perf_counter()
-    item = fetch_aladin_item(isbn)
-    log_time("알라딘 기본정보 조회", t)
+    item = fetch_aladin_item_safe(isbn)
+    v = _view(item)
+    log_time(timeline, "알라딘 기본정보 조회", t)
+
+    # 056용 알라딘 조회(API/웹), 260 발행지 탐색, 020 NLK 조회, 300 상세페이지는
+    # ISBN/item만 있으면 되고 서로 무관 → 미리 백그라운드로 시작 (왕복 시간 합 → 최댓값)
+    # 백그라운드 작업의 ui.* 출력은 bg_ops에 모아 두었다가 결과를 받은 뒤 이 스레드에서 렌더
+    bg_ops: list = []
+    bg_pool = _st_thread_pool(4, ui_ops=bg_ops)
+    f_kdc_info = bg_pool.submit(_kdc_aladin_phase, isbn, ALADIN_TTB_KEY)
+    f_pub_bundle = bg_pool.submit(build_pub_location_bundle, isbn, v.publisher)
+    f_nlk_extra = bg_pool.submit(fetch_additional_code_from_nlk, isbn)
+    f_detail_300 = bg_pool.submit(build_300_from_aladin_detail, item)
+    bg_pool.shutdown(wait=False)
 
     # --------------------------------------------
     # 3) 041 / 546 생성 (GPT 기반)
@@ -4619,13 +5259,9 @@ def generate_all_oneclick(
             tag_041_text = tag_546_text = None
     except Exception:
         tag_041_text = tag_546_text = None
-    log_time("041/546 생성(GPT)", t)
+    log_time(timeline, "041/546 생성(GPT)", t)
 
-    origin_lang = None
-    if tag_041_text:
-        m = re.search(r"\$h([a-z]{3})", tag_041_text, re.IGNORECASE)
-        if m:
-            origin_lang = m.group(1).lower()
+    origin_lang = _extract_lang_h_from_041(tag_041_text)
 
     # --------------------------------------------
     # 4) 245 생성
@@ -4633,7 +5269,7 @@ def generate_all_oneclick(
     t = time.perf_counter()
     marc245 = build_245_with_people_from_sources(item, author_raw, prefer="aladin")
     f_245 = mrk_str_to_field(marc245)
-    log_time("245 생성", t)
+    log_time(timeline, "245 생성", t)
 
     # --------------------------------------------
     # 5) 246 생성
@@ -4641,18 +5277,18 @@ def generate_all_oneclick(
     t = time.perf_counter()
     marc246 = build_246_from_aladin_item(item)
     f_246 = mrk_str_to_field(marc246)
-    log_time("246 생성", t)
+    log_time(timeline, "246 생성", t)
 
     # --------------------------------------------
     # 6) 700 생성
     # --------------------------------------------
     t = time.perf_counter()
-    mrk_700 = build_700_people_pref_aladin(
+    pairs_700 = build_700_people_pref_aladin(
         author_raw,
         item,
         origin_lang_code=origin_lang
     ) or []
-    log_time("700 생성", t)
+    log_time(timeline, "700 생성", t)
 
     # --------------------------------------------
     # 7) 90010 생성 (Wikidata / LOD)
@@ -4660,36 +5296,34 @@ def generate_all_oneclick(
     t = time.perf_counter()
     people = extract_people_from_aladin(item) if item else {}
     mrk_90010 = build_90010_from_wikidata(people, include_translator=False)
-    log_time("90010 생성(LOD/Wikidata)", t)
+    log_time(timeline, "90010 생성(LOD/Wikidata)", t)
 
     # --------------------------------------------
     # 8) 940 생성
     # --------------------------------------------
     t = time.perf_counter()
     a_out, n = parse_245_a_n(marc245)
-    mrk_940 = build_940_from_title_a(
+    pairs_940 = build_940_from_title_a(
         a_out, 
         use_ai=use_ai_940, 
         disable_number_reading=bool(n)
     )
-    log_time("940 생성(GPT)", t)
+    log_time(timeline, "940 생성(GPT)", t)
 
     # --------------------------------------------
     # 9) 260 (발행지/출판사/연도)
     # --------------------------------------------
     t = time.perf_counter()
-    publisher_raw = (item or {}).get("publisher", "")
-    pubdate       = (item or {}).get("pubDate", "")
-    pubyear       = (pubdate[:4] if len(pubdate) >= 4 else "")
+    publisher_raw = v.publisher
+    pubyear       = (v.pubdate[:4] if len(v.pubdate) >= 4 else "")
 
-    bundle = build_pub_location_bundle(isbn, publisher_raw)
-    tag_260 = build_260(
+    bundle = f_pub_bundle.result()
+    f_260, tag_260 = build_260(
         place_display=bundle["place_display"],
         publisher_name=publisher_raw,
         pubyear=pubyear,
     )
-    f_260 = mrk_str_to_field(tag_260)
-    log_time("260 생성(발행지 탐색)", t)
+    log_time(timeline, "260 생성(발행지 탐색)", t)
 
     # --------------------------------------------
     # 10) 008 생성
@@ -4699,27 +5333,27 @@ def generate_all_oneclick(
 
     data_008 = build_008_from_isbn(
         isbn,
-        aladin_pubdate=(item or {}).get("pubDate",""),
-        aladin_title=(item or {}).get("title",""),
-        aladin_category=(item or {}).get("categoryName",""),
-        aladin_desc=(item or {}).get("description",""),
-        aladin_toc=((item or {}).get("subInfo",{}) or {}).get("toc",""),
+        aladin_pubdate=v.pubdate,
+        aladin_title=v.title,
+        aladin_category=v.category,
+        aladin_desc=v.description,
+        aladin_toc=v.toc,
         override_country3=bundle["country_code"],
         override_lang3=lang3_override,
         cataloging_src="a",
     )
     field_008 = Field(tag='008', data=data_008)
-    log_time("008 생성", t)
+    log_time(timeline, "008 생성", t)
 
     # --------------------------------------------
     # 11) 020 / 가격 생성
     # --------------------------------------------
     t = time.perf_counter()
-    tag_020 = _build_020_from_item_and_nlk(isbn, item)
+    nlk_extra = f_nlk_extra.result() or {}
+    tag_020 = _build_020_from_item_and_nlk(isbn, item, nlk_extra=nlk_extra)
     f_020 = mrk_str_to_field(tag_020)
-    nlk_extra = fetch_additional_code_from_nlk(isbn)
     set_isbn = nlk_extra.get("set_isbn", "").strip()
-    log_time("020 생성(NLK/가격)", t)
+    log_time(timeline, "020 생성(NLK/가격)", t)
 
     # --------------------------------------------
     # 12) 653 생성 (GPT)
@@ -4727,23 +5361,26 @@ def generate_all_oneclick(
     t = time.perf_counter()
     tag_653 = _build_653_via_gpt(item)
     f_653 = mrk_str_to_field(tag_653) if tag_653 else None
-    log_time("653 생성(GPT)", t)
+    log_time(timeline, "653 생성(GPT)", t)
 
     # --------------------------------------------
     # 13) 056 (KDC) 생성 (GPT)
     # --------------------------------------------
     t = time.perf_counter()
-    kw_hint = _parse_653_keywords(tag_653) if tag_653 else []
-    kdc_code = get_kdc_from_isbn(
-        isbn,
-        ttbkey=ALADIN_TTB_KEY,
+    # 653 키워드 순서 유지 + 중복 제거, 최대 7개만 힌트로 사용
+    kw_hint = list(itertools.islice(dict.fromkeys(_parse_653_keywords(tag_653)), 7)) if tag_653 else []
+    kdc_info = f_kdc_info.result()
+    n_bg = len(bg_ops)
+    _ui_replay(bg_ops[:n_bg])
+    kdc_code = _kdc_classify_phase(
+        kdc_info,
         openai_key=openai_key,
         model=model,
         keywords_hint=kw_hint
     )
     tag_056 = f"=056  \\\\$a{kdc_code}$26" if kdc_code else None
     f_056 = mrk_str_to_field(tag_056)
-    log_time("056 생성(GPT)", t)
+    log_time(timeline, "056 생성(GPT)", t)
 
     # --------------------------------------------
     # 14) 490 / 830 총서 정보
@@ -4752,14 +5389,15 @@ def generate_all_oneclick(
     tag_490, tag_830 = build_490_830_mrk_from_item(item)
     f_490 = mrk_str_to_field(tag_490)
     f_830 = mrk_str_to_field(tag_830)
-    log_time("490/830 생성", t)
+    log_time(timeline, "490/830 생성", t)
 
     # --------------------------------------------
     # 15) 300 생성 (상세 페이지 크롤링)
     # --------------------------------------------
     t = time.perf_counter()
-    tag_300, f_300 = build_300_from_aladin_detail(item)
-    log_time("300 생성(상세페이지 파싱)", t)
+    tag_300, f_300 = f_detail_300.result()
+    _ui_replay(bg_ops[n_bg:])   # 이 시점엔 백그라운드 작업이 모두 끝남
+    log_time(timeline, "300 생성(상세페이지 파싱)", t)
 
     # --------------------------------------------
     # 16) 950
@@ -4767,22 +5405,51 @@ def generate_all_oneclick(
     t = time.perf_counter()
     tag_950 = build_950_from_item_and_price(item, isbn)
     f_950 = mrk_str_to_field(tag_950)
-    log_time("950 생성", t)
+    log_time(timeline, "950 생성", t)
 
     # --------------------------------------------
     # 17) 049
     # --------------------------------------------
     t = time.perf_counter()
-    field_049 = build_049(reg_mark, reg_no, copy_symbol)
-    f_049 = mrk_str_to_field(field_049)
-    log_time("049 생성", t)
+    f_049, field_049 = build_049(reg_mark, reg_no, copy_symbol)
+    log_time(timeline, "049 생성", t)
 
     # --------------------------------------------
-    # 18) 필드 조립 (pieces append)
+    # 18) 필드 조립 (태그 순서, Field/MRK 둘 다 있는 것만)
     # --------------------------------------------
-    # (너의 기존 코드 그대로 유지 — 생략)
+    # 041/546 MRK 정규화는 여기서 한 번만 → Field 변환·pieces 양쪽에서 같은 문자열 재사용
+    tag_041 = _as_mrk_041(tag_041_text)
+    tag_546 = _as_mrk_546(tag_546_text) if tag_041 else None
+    f_041 = mrk_str_to_field(tag_041)
+    f_546 = mrk_str_to_field(tag_546)
+    # 필드마다 add() 클로저를 부르지 않고 (Field, MRK) 후보를 한 번에 나열 → 필터 한 번으로 pieces 구성
+    candidates = [
+        (field_008, f"=008  {data_008}"),
+        (f_020, tag_020),
+        (f_041, tag_041),
+        (f_049, field_049),
+        (f_056, tag_056),
+        (f_245, marc245),
+        (f_246, marc246),
+        (f_260, tag_260),
+        (f_300, tag_300),
+        (f_490, tag_490),
+        (f_546, tag_546),
+        (f_653, tag_653),
+        *pairs_700,    # 700/940은 빌더가 (Field, MRK) 쌍을 바로 돌려줌
+        (f_830, tag_830),
+        *((mrk_str_to_field(m), m) for m in mrk_90010),
+        *pairs_940,
+        (f_950, tag_950),
+    ]
+    pieces.extend((f, m) for f, m in candidates if f is not None and m)
+    for f, _ in pieces:
+        marc_rec.add_field(f)
 
-    # ... 기존 pieces 조립, MRK 문자열 생성, return 부분 동일 ...
+    meta["Candidates"] = list(people.get("author") or []) if people else []
+    meta["700_count"] = len(pairs_700)
+    meta["90010_count"] = len(mrk_90010 or [])
+    meta["940_count"] = len(pairs_940)
 
     # -----------------------
     # FINAL MRK BUILD
@@ -4793,7 +5460,7 @@ def generate_all_oneclick(
     # -----------------------
     # FINAL MRC BUILD
     # -----------------------
-    marc_bytes = marc_rec.as_marc()
+    marc_bytes = marc_rec.as_marc() if return_marc_bytes else None
 
     # -----------------------
     # RETURN
@@ -4813,6 +5480,7 @@ def run_and_export(
     use_ai_940: bool = True,
     save_dir: str = "./output",
     preview_in_streamlit: bool = True,
+    save_to_disk: bool = True,        # 일괄 처리에서는 False로 두고 호출 쪽에서 건별로 바로 기록
 ):
     record, marc_bytes, mrk_text, meta = generate_all_oneclick(
         isbn,
@@ -4820,12 +5488,15 @@ def run_and_export(
         reg_no=reg_no,
         copy_symbol=copy_symbol,
         use_ai_940=use_ai_940,
+        return_marc_bytes=preview_in_streamlit,   # mrc 바이트는 다운로드 버튼에서만 사용
     )
 
-    save_marc_files(record, save_dir, isbn)
+    if save_to_disk:
+        save_marc_files(record, save_dir, isbn, marc_bytes)
 
     if preview_in_streamlit:
-        st.success("📦 MRC/MRK 파일이 저장되었습니다.")
+        if save_to_disk:
+            st.success("📦 MRC/MRK 파일이 저장되었습니다.")
         with st.expander("MRK 미리보기", expanded=True):
             st.text_area("MRK", mrk_text, height=320)
 
@@ -4848,17 +5519,31 @@ def run_and_export(
         # ============================
         import pandas as pd
         with st.expander("⏱️ 처리 시간 타임라인", expanded=True):
-            df = pd.DataFrame(TIMELINE)
+            df = pd.DataFrame((meta or {}).get("timeline") or [])
             st.dataframe(df, height=400)
 
     return record, marc_bytes, mrk_text, meta
 
+def _run_and_export_collecting(isbn: str, **kwargs):
+    """일괄 처리 워커용 run_and_export: 처리 중 ui.* 출력을 meta["ui_log"]에 모아 반환 (렌더는 메인 스레드에서 _ui_replay)"""
+    ops: list = []
+    _ui_local.ops = ops
+    try:
+        record, marc_bytes, mrk_text, meta = run_and_export(isbn, **kwargs)
+    finally:
+        _ui_local.ops = None
+    if isinstance(meta, dict):
+        meta["ui_log"] = ops
+    return record, marc_bytes, mrk_text, meta
+
 
 # ========== MRC/MRK Export Helpers ==========
 def record_to_mrk_from_record(rec: Record) -> str:
     lines = []
     # LDR
-    leader = rec.leader.decode("utf-8") if isinstance(rec.leader, (bytes, bytearray)) else str(rec.leader)
+    leader = rec.leader
+    if leader.__class__ is not str:  # 대부분 str → 타입 분기 없이 통과 (pymarc Leader 객체/bytes만 변환)
+        leader = leader.decode("utf-8") if isinstance(leader, (bytes, bytearray)) else str(leader)
     lines.append("=LDR  " + leader)
 
     for f in rec.get_fields():
@@ -4869,48 +5554,49 @@ def record_to_mrk_from_record(rec: Record) -> str:
             continue
 
         # 데이터필드
-        ind1 = (f.indicators[0] if getattr(f, "indicators", None) else " ") or " "
-        ind2 = (f.indicators[1] if getattr(f, "indicators", None) else " ") or " "
+        inds = getattr(f, "indicators", None)  # 필드당 한 번만 조회
+        ind1 = (inds[0] if inds else " ") or " "
+        ind2 = (inds[1] if inds else " ") or " "
         # 화면 표시용으론 공백→'\'로 보이게
         ind1_disp = "\\" if ind1 == " " else ind1
         ind2_disp = "\\" if ind2 == " " else ind2
 
-        parts = ""
         subs = getattr(f, "subfields", None)
 
-        # 신형: Subfield 객체 리스트
+        # 신형: Subfield 객체 리스트 → '$' + '$'.join(...) 로 루프를 str.join(C)에 맡김
         if isinstance(subs, list) and subs and isinstance(subs[0], Subfield):
-            for s in subs:
-                parts += f"${s.code}{s.value}"
+            parts = "$" + "$".join([s.code + str(s.value) for s in subs])
 
         # 구형: [code, value, code, value, ...]
         elif isinstance(subs, list):
             it = iter(subs)
+            buf = []  # str += 반복 대신 조각을 모아 한 번에 join
             for code, val in zip(it, it):
-                parts += f"${code}{val}"
+                buf.append("$"); buf.append(str(code)); buf.append(str(val))
+            parts = "".join(buf)
 
         # 혹시 모를 폴백
         else:
+            buf = []
             try:
                 for s in f:
-                    parts += f"${s.code}{s.value}"
+                    buf.append("$"); buf.append(str(s.code)); buf.append(str(s.value))
             except Exception:
                 pass
+            parts = "".join(buf)
 
-        lines.append(f"={tag}  {ind1_disp}{ind2_disp}{parts}")
+        lines.append("".join(("=", tag, "  ", ind1_disp, ind2_disp, parts)))
 
     return "\n".join(lines)
 
-def save_marc_files(record: Record, save_dir: str, base_filename: str) -> tuple[str, str]:
-    """
-    .mrc(바이너리)와 .mrk(텍스트)를 모두 저장하고 경로를 반환
-    """
-    import os
-    os.makedirs(save_dir, exist_ok=True)
+_MARC_WRITE_BUFSIZE = 1 << 20  # 1 MiB: 일괄 저장 시 write syscall 횟수 축소
 
+def _write_marc_pair(record: Record, save_dir: str, base_filename: str, marc_bytes: bytes | None = None) -> tuple[str, str]:
+    """save_dir(이미 존재)에 {base_filename}.mrc / .mrk 기록 (marc_bytes를 주면 as_marc() 재직렬화 생략)"""
+    import os
     mrc_path = os.path.join(save_dir, f"{base_filename}.mrc")
-    with open(mrc_path, "wb") as f:
-        f.write(record.as_marc())
+    with open(mrc_path, "wb", buffering=_MARC_WRITE_BUFSIZE) as f:
+        f.write(marc_bytes if marc_bytes is not None else record.as_marc())
         
 
     mrk_path = os.path.join(save_dir, f"{base_filename}.mrk")
@@ -4920,11 +5606,20 @@ def save_marc_files(record: Record, save_dir: str, base_filename: str) -> tuple[
     except Exception:
         mrk_text = record_to_mrk_from_record(record)
 
-    with open(mrk_path, "w", encoding="utf-8") as f:
+    with open(mrk_path, "w", encoding="utf-8", buffering=_MARC_WRITE_BUFSIZE, newline="\n") as f:
         f.write(mrk_text)
 
     return mrc_path, mrk_path
 
+def save_marc_files(record: Record, save_dir: str, base_filename: str, marc_bytes: bytes | None = None) -> tuple[str, str]:
+    """
+    .mrc(바이너리)와 .mrk(텍스트)를 모두 저장하고 경로를 반환
+    (이미 직렬화한 marc_bytes가 있으면 그대로 기록)
+    """
+    import os
+    os.makedirs(save_dir, exist_ok=True)
+    return _write_marc_pair(record, save_dir, base_filename, marc_bytes)
+
 
 # =========================
 # 🎛️ Streamlit UI
@@ -4962,14 +5657,17 @@ if submitted:
 
     if uploaded is not None:
         try:
-            df = load_uploaded_csv(uploaded)
+            columns, rows = load_uploaded_csv(uploaded)
             need_cols = {"ISBN", "등록기호", "등록번호", "별치기호"}
-            if not need_cols.issubset(df.columns):
+            if not need_cols.issubset(columns):
                 st.error("❌ 필요한 열이 없습니다: ISBN, 등록기호, 등록번호, 별치기호")
                 st.stop()
-            rows = df[["ISBN", "등록기호", "등록번호", "별치기호"]].dropna(subset=["ISBN"]).copy()
-            rows["별치기호"] = rows["별치기호"].fillna("")
-            jobs.extend(rows.values.tolist())
+            # ISBN 빈 행은 건너뛰고, 빈 칸은 "" 로
+            jobs.extend(
+                [row["ISBN"], row["등록기호"] or "", row["등록번호"] or "", row["별치기호"] or ""]
+                for row in rows
+                if (row["ISBN"] or "").strip()
+            )
         except Exception as e:
             st.error(f"❌ CSV 읽기 실패: {e}")
             st.stop()
@@ -4980,50 +5678,80 @@ if submitted:
 
     # ✅ 여기부터는 네 기존 '변환 실행 버튼 클릭 시' 로직 그대로 복붙
     st.write(f"총 {len(jobs)}건 처리 중…")
+    if len(jobs) > 1:
+        # 여러 건이면 653 GPT 응답을 먼저 병렬로 받아 두고, 아래 건별 처리에서는 캐시를 사용
+        prewarm_653_cache([str(job[0]).strip() for job in jobs])
     prog = st.progress(0)
 
     marc_all: list[str] = []
     st.session_state.meta_all = {}
-    results: list[tuple[Record, str, str, dict]] = []
-
-    for i, (isbn, reg_mark, reg_no, copy_symbol) in enumerate(jobs, start=1):
-        record, marc_bytes, mrk_text, meta = run_and_export(
-            isbn,
-            reg_mark=reg_mark,
-            reg_no=reg_no,
-            copy_symbol=copy_symbol,
-            use_ai_940=True,
-            save_dir="./output",
-            preview_in_streamlit=True,   # CLI면 False
-        )
-
-        cand = ", ".join(meta.get("Candidates", [])) if meta else ""
-        c700 = meta.get("700_count", None) if meta else None
-        c90010 = meta.get("90010_count", 0) if meta else 0
-        c940 = meta.get("940_count", 0) if meta else 0
-
-        st.caption(f"ISBN: {isbn}  |  후보저자: {cand}  | 700={c700 if c700 is not None else '—'}  90010={c90010}  940={c940}")
-        st.write(f"[DEBUG] MRK length={len(mrk_text)}")
-        st.code(mrk_text or "(MRK 생성 실패)", language="text")
-
-        with st.expander(f"🧭 메타 보기 · {isbn}"):
-            if meta:
-                safe_meta = {k: v for k, v in meta.items() if k != "debug_lines"}
-                st.subheader("Meta (요약)")
-                st.json(safe_meta)
-                dbg_lines = meta.get("debug_lines") or []
-                st.subheader("Debug Lines")
-                if dbg_lines:
-                    st.text("\n".join(str(x) for x in dbg_lines))
+    results: list[tuple[str, str, dict]] = []   # Record는 담지 않음 (아래에서 바로 기록)
+
+    # 통합 MRC는 레코드를 다 모았다가 쓰지 않고, 한 건씩 끝나는 대로 버퍼에 흘려 씀
+    mrc_buffer = io.BytesIO()
+    saved = 0
+
+    # 건별 처리는 대부분 네트워크 대기(NLK/알라딘/OpenAI) → 여러 건을 스레드 풀로 동시에 돌리고,
+    # 화면 출력은 메인 스레드에서 CSV 순서대로 (결과 파일 순서도 입력 순서 유지)
+    with _st_thread_pool(min(8, len(jobs))) as job_pool:
+        futures = [
+            job_pool.submit(
+                _run_and_export_collecting,
+                isbn,
+                reg_mark=reg_mark,
+                reg_no=reg_no,
+                copy_symbol=copy_symbol,
+                use_ai_940=True,
+                save_dir="./output",
+                preview_in_streamlit=False,  # 워커에서는 st.* 미리보기 출력 안 함 (중간 출력은 meta["ui_log"]로)
+                save_to_disk=False,          # 파일 저장은 아래 루프에서 건별로
+            )
+            for isbn, reg_mark, reg_no, copy_symbol in jobs
+        ]
+        for i, (job, fut) in enumerate(zip(jobs, futures), start=1):
+            isbn = job[0]
+            record, _, mrk_text, meta = fut.result()
+
+            cand = ", ".join(meta.get("Candidates", [])) if meta else ""
+            c700 = meta.get("700_count", None) if meta else None
+            c90010 = meta.get("90010_count", 0) if meta else 0
+            c940 = meta.get("940_count", 0) if meta else 0
+
+            st.caption(f"ISBN: {isbn}  |  후보저자: {cand}  | 700={c700 if c700 is not None else '—'}  90010={c90010}  940={c940}")
+            _ui_replay(meta.get("ui_log") if meta else None)   # 워커에서 모아 둔 경고/디버그 출력
+            st.write(f"[DEBUG] MRK length={len(mrk_text)}")
+            st.code(mrk_text or "(MRK 생성 실패)", language="text")
+
+            with st.expander(f"🧭 메타 보기 · {isbn}"):
+                if meta:
+                    safe_meta = {k: v for k, v in meta.items() if k not in ("debug_lines", "ui_log")}
+                    st.subheader("Meta (요약)")
+                    st.json(safe_meta)
+                    dbg_lines = meta.get("debug_lines") or []
+                    st.subheader("Debug Lines")
+                    if dbg_lines:
+                        st.text("\n".join(str(x) for x in dbg_lines))
+                    else:
+                        st.caption("표시할 디버그 로그가 없습니다.")
                 else:
-                    st.caption("표시할 디버그 로그가 없습니다.")
+                    st.caption("메타 데이터 없음")
+
+            if isinstance(record, Record):
+                rec_bytes = record.as_marc()   # 직렬화는 한 번만 → 개별 파일/통합 MRC 공용
+                save_marc_files(record, "./output", isbn, rec_bytes)    # 레코드별 .mrc/.mrk
+                mrc_buffer.write(rec_bytes)                              # 통합 MRC (MARCWriter.write와 같은 바이트)
+                saved += 1
             else:
-                st.caption("메타 데이터 없음")
+                st.warning(f"⚠️ MRC 변환 실패: Record 객체가 아님, {isbn}")
+            futures[i - 1] = None   # 다 쓴 Future(레코드 포함) 참조를 놓아 바로 회수되게
 
-        marc_all.append(mrk_text)
-        st.session_state.meta_all[isbn] = meta
-        results.append((record, isbn, mrk_text, meta))
-        prog.progress(i / len(jobs))
+            marc_all.append(mrk_text)
+            st.session_state.meta_all[isbn] = meta
+            results.append((isbn, mrk_text, meta))
+            prog.progress(i / len(jobs))
+
+    if saved:
+        st.success(f"📦 MRC/MRK 파일 {saved}건이 저장되었습니다.")
 
     blob = ("\n\n".join(marc_all)).encode("utf-8-sig")
     st.download_button(
@@ -5034,17 +5762,10 @@ if submitted:
         key="dl_all_marc",
     )
 
-    buffer = io.BytesIO()
-    writer = MARCWriter(buffer)
-    for record_obj, isbn, _, _ in results:
-        if not isinstance(record_obj, Record):
-            st.warning(f"⚠️ MRC 변환 실패: Record 객체가 아님, {isbn}")
-            continue
-        writer.write(record_obj)
-    buffer.seek(0)
+    mrc_buffer.seek(0)
     st.download_button(
         label="📥 MRC 파일 다운로드",
-        data=buffer,
+        data=mrc_buffer,
         file_name="marc_output.mrc",
         mime="application/octet-stream",
         key="dl_mrc",